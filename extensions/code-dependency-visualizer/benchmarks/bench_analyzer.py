@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Benchmark find_unused_files.py on synthetic projects of configurable size.
+
+Generates package trees (module count, package depth, import fan-out, share of relative imports,
+files in gitignored directories) and measures, for each phase of an analysis, the wall time, the
+peak RSS of the process, the number of read/write system calls and the number of stat, open and
+directory-listing calls:
+
+    _find_all_python_files   walk the project and build the module index
+    build_dependency_graph   trace the imports of one entry point (parses the reachable files)
+    analyze                  trace several entry points over the global import graph
+    json                     convert the graph for the VS Code extension and serialize it
+
+Each project is measured in a fresh interpreter, so RSS figures do not leak between sizes. Peak RSS
+is the high-water mark of the process after the phase (it includes the earlier phases).
+
+Read/write counts come from /proc/self/io (Linux only), which counts nothing else. Stat, open and
+scandir calls are counted by wrapping os.stat/os.lstat/os.fstat, open/io.open/os.open, os.scandir
+and DirEntry.stat() in the measuring process; calls made from C code (sqlite) or by worker
+processes (--jobs) are not seen.
+
+Usage:
+    python benchmarks/bench_analyzer.py --modules 1000 10000 --output results.json
+    python benchmarks/bench_analyzer.py --modules 1000 --compare results.json
+"""
+
+import argparse
+import builtins
+import io
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ANALYZER_DIR = Path(__file__).resolve().parent.parent
+MODULES_PER_PACKAGE = 20
+PACKAGE_BRANCHING = 8
+IGNORED_DIRS = ('build', 'generated')
+
+
+def package_parts(package: int, depth: int) -> List[str]:
+    """Package path of the n-th package: its index in base PACKAGE_BRANCHING, one digit per level."""
+    parts = []
+    for level in range(depth):
+        parts.append(f"pkg{level}_{package % PACKAGE_BRANCHING}")
+        package //= PACKAGE_BRANCHING
+    return list(reversed(parts))
+
+
+def generate_project(
+    root: Path,
+    modules: int,
+    depth: int,
+    fan_out: int,
+    relative_ratio: float,
+    ignored_ratio: float,
+    seed: int
+) -> List[Path]:
+    """
+    Write a synthetic project and return its entry points.
+
+    Modules are grouped MODULES_PER_PACKAGE to a package; each imports fan_out random modules
+    (and a couple of stdlib modules), using a relative import when the target shares its package
+    and the coin says so.
+    """
+    rng = random.Random(seed)
+    locations = []  # (package parts, module name) per module index
+    for index in range(modules):
+        locations.append((package_parts(index // MODULES_PER_PACKAGE, depth), f"mod{index}"))
+
+    packages = {tuple(parts) for parts, _ in locations}
+    for parts in packages:
+        for level in range(1, len(parts) + 1):
+            init = root.joinpath(*parts[:level], '__init__.py')
+            if not init.exists():
+                init.parent.mkdir(parents=True, exist_ok=True)
+                init.write_text('')
+
+    for index, (parts, name) in enumerate(locations):
+        lines = ['import os', 'import json']
+        for target in rng.sample(range(modules), min(fan_out, modules)):
+            if target == index:
+                continue
+            target_parts, target_name = locations[target]
+            if target_parts == parts and rng.random() < relative_ratio:
+                lines.append(f"from .{target_name} import function_{target}")
+            elif rng.random() < 0.5:
+                lines.append(f"from {'.'.join(target_parts)}.{target_name} import function_{target}")
+            else:
+                lines.append(f"import {'.'.join(target_parts)}.{target_name}")
+        lines.append('')
+        lines.append(f"def function_{index}(value):")
+        lines.append(f"    return json.dumps({{'module': {index}, 'value': value, 'cwd': os.getcwd()}})")
+        root.joinpath(*parts, f"{name}.py").write_text('\n'.join(lines) + '\n')
+
+    # Ignored trees the walker must prune without descending into them
+    (root / '.gitignore').write_text(''.join(f"{name}/\n" for name in IGNORED_DIRS) + '*.pyc\n')
+    for index in range(int(modules * ignored_ratio)):
+        ignored = root / IGNORED_DIRS[index % len(IGNORED_DIRS)] / f"copy{index // 100}"
+        ignored.mkdir(parents=True, exist_ok=True)
+        (ignored / f"mod{index}.py").write_text('import os\n')
+
+    entry_points = []
+    for number, target in enumerate(rng.sample(range(modules), min(3, modules))):
+        target_parts, target_name = locations[target]
+        entry_point = root / f"main{number}.py"
+        entry_point.write_text(f"from {'.'.join(target_parts)}.{target_name} import function_{target}\n")
+        entry_points.append(entry_point)
+    return entry_points
+
+
+class _CountingDirEntry:
+    """os.DirEntry proxy counting the first stat() call (later calls are answered from its cache)."""
+
+    def __init__(self, entry: os.DirEntry, counts: Dict[str, int]):
+        self._entry = entry
+        self._counts = counts
+        self._statted = set()
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def stat(self, *, follow_symlinks=True):
+        if follow_symlinks not in self._statted:
+            self._statted.add(follow_symlinks)
+            self._counts['stat'] += 1
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+
+class _CountingScandir:
+    """os.scandir iterator proxy yielding counting entries."""
+
+    def __init__(self, iterator, counts: Dict[str, int]):
+        self._iterator = iterator
+        self._counts = counts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._iterator.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> _CountingDirEntry:
+        return _CountingDirEntry(next(self._iterator), self._counts)
+
+    def close(self):
+        self._iterator.close()
+
+
+class FileSystemCalls:
+    """Counts the stat, open and scandir calls made through Python in this process."""
+
+    def __init__(self):
+        self.counts = {'stat': 0, 'open': 0, 'scandir': 0}
+
+    def _counting(self, function: Callable, kind: str) -> Callable:
+        counts = self.counts
+
+        def wrapper(*args, **kwargs):
+            counts[kind] += 1
+            return function(*args, **kwargs)
+        return wrapper
+
+    def install(self):
+        """Wrap the os/io functions; pathlib and the analyzer look them up at call time."""
+        for module, name, kind in (
+            (os, 'stat', 'stat'), (os, 'lstat', 'stat'), (os, 'fstat', 'stat'),
+            (builtins, 'open', 'open'), (io, 'open', 'open'), (os, 'open', 'open'),
+        ):
+            setattr(module, name, self._counting(getattr(module, name), kind))
+
+        scandir = os.scandir
+        counts = self.counts
+
+        def counting_scandir(*args, **kwargs):
+            counts['scandir'] += 1
+            return _CountingScandir(scandir(*args, **kwargs), counts)
+        os.scandir = counting_scandir
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self.counts)
+
+
+class PhaseTimer:
+    """Records wall time, peak RSS, read/write syscalls and file-system calls around each benchmark phase."""
+
+    def __init__(self, fs_calls: Optional[FileSystemCalls] = None):
+        self.phases: Dict[str, Dict] = {}
+        self.fs_calls = fs_calls
+
+    @staticmethod
+    def _syscalls() -> Optional[Dict[str, int]]:
+        try:
+            with open('/proc/self/io') as f:
+                fields = dict(line.split(': ') for line in f.read().splitlines())
+            return {'read': int(fields['syscr']), 'write': int(fields['syscw'])}
+        except (OSError, KeyError, ValueError):
+            return None  # Not on Linux
+
+    @staticmethod
+    def _peak_rss_mb() -> float:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+    def run(self, name: str, function):
+        before = self._syscalls()
+        # Taken inside the /proc/self/io reads, so those opens are not counted
+        fs_before = self.fs_calls.snapshot() if self.fs_calls else None
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        fs_after = self.fs_calls.snapshot() if self.fs_calls else None
+        after = self._syscalls()
+
+        self.phases[name] = {
+            'seconds': round(seconds, 4),
+            'peak_rss_mb': self._peak_rss_mb(),
+            'read_syscalls': after['read'] - before['read'] if before and after else None,
+            'write_syscalls': after['write'] - before['write'] if before and after else None,
+            **{
+                f"{kind}_calls": fs_after[kind] - fs_before[kind] if fs_before and fs_after else None
+                for kind in ('stat', 'open', 'scandir')
+            },
+        }
+        return result
+
+
+def measure(project_root: Path, entry_points: List[Path], max_depth: int, jobs: int) -> Dict:
+    """Run every phase on one project (in this process) and return the measurements."""
+    sys.path.insert(0, str(ANALYZER_DIR))
+    from find_unused_files import ImportTracer, dependency_graph_to_json
+
+    fs_calls = FileSystemCalls()
+    fs_calls.install()
+    timer = PhaseTimer(fs_calls)
+    tracer = timer.run('_find_all_python_files', lambda: ImportTracer(project_root, use_cache=False, jobs=jobs))
+    traversal = timer.run('build_dependency_graph', lambda: tracer.traverse(entry_points[0], max_depth))
+    results = timer.run('analyze', lambda: tracer.analyze(entry_points, max_depth))
+    document = timer.run('json', lambda: json.dumps(dependency_graph_to_json(
+        project_root, entry_points[0], traversal.files, traversal.graph, max_depth, traversal=traversal
+    ), indent=2))
+    tracer.close()
+
+    return {
+        'python_files': len(tracer.all_python_files),
+        'graph_files': len(traversal.files),
+        'analyzed_files': len(set().union(*results.values())) if results else 0,
+        'json_bytes': len(document),
+        'phases': timer.phases,
+    }
+
+
+def compare(results: Dict, baseline: Dict):
+    """Print the time ratio of every phase against a previous results file."""
+    previous = {(project['modules'], project['depth']): project for project in baseline.get('projects', [])}
+    for project in results['projects']:
+        old = previous.get((project['modules'], project['depth']))
+        if old is None:
+            continue
+        print(f"\n{project['modules']} modules vs baseline:")
+        for phase, measurement in project['phases'].items():
+            old_seconds = old['phases'].get(phase, {}).get('seconds')
+            if old_seconds:
+                print(f"  {phase:24} {measurement['seconds'] / old_seconds:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dependency analyzer on synthetic projects.")
+    parser.add_argument('--modules', type=int, nargs='+', default=[1000, 10000, 50000],
+                        help='Project sizes, in modules (default: 1000 10000 50000)')
+    parser.add_argument('--depth', type=int, default=3, help='Package nesting depth (default: 3)')
+    parser.add_argument('--fan-out', type=int, default=5, help='Imports per module (default: 5)')
+    parser.add_argument('--relative-ratio', type=float, default=0.3,
+                        help='Share of same-package imports written as relative imports (default: 0.3)')
+    parser.add_argument('--ignored-ratio', type=float, default=0.2,
+                        help='Extra files in gitignored directories, relative to the module count (default: 0.2)')
+    parser.add_argument('--max-depth', type=int, default=10, help='Analysis depth (default: 10)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Parser worker processes (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the generated projects')
+    parser.add_argument('--output', type=Path, help='Write the results to this JSON file')
+    parser.add_argument('--compare', type=Path, help='Print the time ratios against a previous results file')
+    parser.add_argument('--measure', type=Path, help=argparse.SUPPRESS)  # Child mode: project root to measure
+    parser.add_argument('--entry', type=Path, nargs='*', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.entry, args.max_depth, args.jobs)))
+        return
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'projects': [],
+    }
+    for modules in args.modules:
+        with tempfile.TemporaryDirectory() as tmp:
+            project_root = Path(tmp).resolve()
+            start = time.perf_counter()
+            entry_points = generate_project(
+                project_root, modules, args.depth, args.fan_out, args.relative_ratio, args.ignored_ratio, args.seed
+            )
+            generated = time.perf_counter() - start
+
+            output = subprocess.run(
+                [
+                    sys.executable, __file__, '--measure', str(project_root),
+                    '--entry', *map(str, entry_points),
+                    '--max-depth', str(args.max_depth), '--jobs', str(args.jobs),
+                ],
+                stdout=subprocess.PIPE, check=True, text=True
+            ).stdout
+            measurement = json.loads(output)
+
+        project = {
+            'modules': modules,
+            'depth': args.depth,
+            'fan_out': args.fan_out,
+            'relative_ratio': args.relative_ratio,
+            'ignored_ratio': args.ignored_ratio,
+            'max_depth': args.max_depth,
+            'jobs': args.jobs,
+            'generation_seconds': round(generated, 2),
+            **measurement,
+        }
+        results['projects'].append(project)
+
+        print(f"{modules} modules ({project['python_files']} Python files, "
+              f"{project['graph_files']} in the graph, {project['analyzed_files']} analyzed)")
+        for phase, m in project['phases'].items():
+            io_calls = ''
+            if m['read_syscalls'] is not None:
+                io_calls = f"  {m['read_syscalls']:>8} read {m['write_syscalls']:>6} write"
+            fs_calls = f"  {m['stat_calls']:>8} stat {m['open_calls']:>7} open {m['scandir_calls']:>6} scandir"
+            print(f"  {phase:24} {m['seconds']:9.3f} s  peak RSS {m['peak_rss_mb']:8.1f} MB{io_calls}{fs_calls}")
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
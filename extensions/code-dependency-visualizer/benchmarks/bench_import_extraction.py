@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark the import extraction strategies of find_unused_files.py on large generated files.
+
+Compares the full ast.walk extractor the analyzer used to run, the statement-only visitor it uses
+now, and the tokenizer fast path (--fast-parse). Reports throughput and the peak memory allocated
+while parsing one file, and checks that all strategies find the same imports.
+
+Usage:
+    python benchmarks/bench_import_extraction.py [--lines 20000 50000] [--repeat 5] [--output results.json]
+"""
+
+import argparse
+import ast
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import find_unused_files  # noqa: E402
+from find_unused_files import ParsedFile, _ImportRecorder, extract_imports  # noqa: E402
+
+
+def extract_with_walk(file_path: Path, project_root: Path) -> ParsedFile:
+    """The previous extractor: visit every node of the tree, expressions included."""
+    content = file_path.read_bytes()
+    recorder = _ImportRecorder(file_path, project_root)
+    tree = ast.parse(content)
+    definitions = [
+        node.name for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    ]
+    referenced = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            referenced.add(node.id)
+        elif isinstance(node, ast.Import):
+            recorder.add_import([alias.name for alias in node.names])
+        elif isinstance(node, ast.ImportFrom):
+            recorder.add_import_from(node.module, [alias.name for alias in node.names], node.level)
+    return ParsedFile(
+        recorder.imports,
+        {module: sorted(set(names)) for module, names in recorder.symbols.items()},
+        [name for name in definitions if name not in referenced]
+    )
+
+
+STRATEGIES: Dict[str, Callable[[Path, Path], ParsedFile]] = {
+    'walk': extract_with_walk,
+    'visitor': lambda file_path, project_root: extract_imports(file_path, project_root)[0],
+    'tokenize': lambda file_path, project_root: extract_imports(file_path, project_root, fast=True)[0],
+}
+
+
+def generate_module(lines: int, nested_imports: bool) -> str:
+    """Generate a module of roughly the given number of lines: imports on top, then expression-heavy code."""
+    out = [
+        '"""Generated module."""',
+        'import os',
+        'import sys, json as _json',
+        'from collections import defaultdict, OrderedDict',
+        'from . import sibling',
+        'from .pkg.helpers import (helper_one,',
+        '                          helper_two as two)',
+        '',
+    ]
+    index = 0
+    while len(out) < lines:
+        out.append(f'class Model{index}:')
+        out.append(f'    """Model {index}: from the docs, import nothing here."""')
+        out.append('    def compute(self, values, scale=2):')
+        if nested_imports and index % 10 == 0:
+            out.append('        from math import sqrt')
+        out.append('        total = sum(v * scale + (v ** 2 if v % 3 else -v) for v in values)')
+        out.append('        data = {k: [x for x in range(k) if x % 2] for k in values if k < 50}')
+        out.append(f'        return total + len(data) + helper_one(values, key=lambda x: (x, -x, {index}))')
+        out.append('')
+        out.append(f'def function_{index}(a, b, *args, **kwargs):')
+        out.append(f'    result = [Model{index}().compute(range(n)) for n in (a, b, *args) if n]')
+        out.append('    return {"sum": sum(result), "max": max(result or [0]), "kw": sorted(kwargs.items())}')
+        out.append('')
+        index += 1
+    return '\n'.join(out) + '\n'
+
+
+def normalized(parsed: ParsedFile, with_definitions: bool = True) -> tuple:
+    return (
+        sorted(parsed.imports),
+        parsed.symbols,
+        parsed.definitions if with_definitions else None,
+    )
+
+
+def bench_file(file_path: Path, project_root: Path, repeat: int) -> Dict[str, Dict[str, float]]:
+    size_mb = file_path.stat().st_size / (1024 * 1024)
+    results = {}
+    outputs = {}
+    for name, strategy in STRATEGIES.items():
+        strategy(file_path, project_root)  # Warm up the page cache and imports
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs[name] = strategy(file_path, project_root)
+            times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        strategy(file_path, project_root)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        best = min(times)
+        results[name] = {
+            'best_seconds': round(best, 5),
+            'mb_per_second': round(size_mb / best, 2),
+            'peak_mb': round(peak / (1024 * 1024), 2),
+        }
+
+    if normalized(outputs['visitor']) != normalized(outputs['tokenize']):
+        raise SystemExit(f"visitor and tokenize results differ for {file_path.name}")
+    if normalized(outputs['walk'], False) != normalized(outputs['visitor'], False):
+        raise SystemExit(f"walk and visitor imports differ for {file_path.name}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the import extraction strategies on large files.")
+    parser.add_argument('--lines', type=int, nargs='+', default=[5000, 20000, 50000],
+                        help='Sizes of the generated files, in lines (default: 5000 20000 50000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per strategy and file (default: 5)')
+    parser.add_argument('--output', type=Path, help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    report = {
+        'python': platform.python_version(),
+        'analyzer': Path(find_unused_files.__file__).name,
+        'files': [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        project_root = Path(tmp)
+        for lines in args.lines:
+            for nested_imports in (False, True):
+                file_path = project_root / f"module_{lines}_{'nested' if nested_imports else 'flat'}.py"
+                file_path.write_text(generate_module(lines, nested_imports))
+                size_mb = file_path.stat().st_size / (1024 * 1024)
+                results = bench_file(file_path, project_root, args.repeat)
+                report['files'].append({
+                    'lines': lines,
+                    'nested_imports': nested_imports,
+                    'size_mb': round(size_mb, 2),
+                    'strategies': results,
+                })
+
+                print(f"{lines:>7} lines, {'nested' if nested_imports else 'flat':6} ({size_mb:.2f} MB)")
+                for name, result in results.items():
+                    print(f"  {name:9} {result['best_seconds'] * 1000:9.1f} ms  "
+                          f"{result['mb_per_second']:7.2f} MB/s  peak {result['peak_mb']:7.2f} MB")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,7 @@ Features:
 - Respects .gitignore files
 - Comprehensive import tracing
 - Clear reporting of unused files
+- Persistent import cache (.depcache) so warm runs only reparse changed files
 """
 
 import ast
@@ -16,17 +17,33 @@ import os
 import sys
 import argparse
 from pathlib import Path
-from typing import Set, Dict, List, Tuple, Optional
+from typing import Set, Dict, List, Tuple, Optional, NamedTuple, Callable, Iterator, FrozenSet
 import importlib.util
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice, repeat
 import fnmatch
 import re
 import json
+import hashlib
+import io
+import tokenize
+import sqlite3
+import threading
+import time
+from array import array
 
 
-# TODO: make it ignore the gitignore files/folders
 class GitignoreParser:
-    """Simple gitignore parser to filter out ignored files."""
+    """
+    Gitignore matcher following git's rules.
+
+    Supports negation (!), directory-only patterns, anchored and ** patterns, per-directory
+    .gitignore files and .git/info/exclude. The rules of each ignore file are compiled into a
+    single regex, and directory verdicts are memoized so files inside an already-evaluated
+    directory only test their own name.
+    """
 
     def __init__(self, project_root: Path, debug: bool = False):
         """
@@ -36,15 +53,21 @@ class GitignoreParser:
         :param debug: Whether to print debug information
         """
         self.project_root = project_root
-        self.patterns = []
         self.debug = debug
-        # Add common patterns that should always be ignored
-        self._add_default_patterns()
-        self._load_gitignore()
+        # directory (relative posix path, '' for the root) -> rule set of its .gitignore, or None
+        self._scopes: Dict[str, Optional[Tuple[Optional[re.Pattern], Optional[re.Pattern], Set[str]]]] = {}
+        # directory (relative posix path) -> whether it is ignored
+        self._dir_verdicts: Dict[str, bool] = {'': False}
+        # Lowest-priority rules, anchored at the project root: .git/info/exclude, then the defaults
+        self._fallback_scopes = [
+            self._compile(self._read_lines(project_root / '.git' / 'info' / 'exclude'), '.git/info/exclude'),
+            self._compile(self._default_patterns(), 'default'),
+        ]
 
-    def _add_default_patterns(self):
-        """Add common patterns that should always be ignored."""
-        default_patterns = [
+    @staticmethod
+    def _default_patterns() -> List[str]:
+        """Common patterns that should always be ignored."""
+        return [
             '__pycache__/',
             '*.pyc',
             '*.pyo',
@@ -64,294 +87,1558 @@ class GitignoreParser:
             'node_modules/',
         ]
 
-        for pattern in default_patterns:
-            regex_pattern = self._gitignore_to_regex(pattern)
-            self.patterns.append(regex_pattern)
+    @staticmethod
+    def _read_lines(path: Path) -> List[str]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read().splitlines()
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Warning: Could not parse {path}: {e}", file=sys.stderr)
+            return []
+
+    def _compile(self, lines: List[str], source: str) -> Optional[Tuple[Optional[re.Pattern], Optional[re.Pattern], Set[str]]]:
+        """
+        Compile the rules of one ignore file into a (file regex, directory regex, negated group names) triple.
+
+        Rules are joined in reverse order, each in its own named group, so the first alternative
+        that matches is the last matching rule in the file - the one git gives precedence to.
+        """
+        file_alternatives = []
+        dir_alternatives = []
+        negated_groups: Set[str] = set()
+
+        for index, line in enumerate(lines):
+            rule = self._parse_rule(line)
+            if rule is None:
+                continue
+            regex, negated, dir_only = rule
+            group = f"r{index}"
+            alternative = f"(?P<{group}>{regex})"
+            if negated:
+                negated_groups.add(group)
+            dir_alternatives.append(alternative)
+            if not dir_only:
+                file_alternatives.append(alternative)
             if self.debug:
-                print(f"Added default pattern: {pattern} -> {regex_pattern.pattern}", file=sys.stderr)
+                print(f"Added {source} pattern: {line.strip()} -> {regex}", file=sys.stderr)
+
+        if not dir_alternatives:
+            return None
+
+        def combine(alternatives: List[str]) -> Optional[re.Pattern]:
+            return re.compile('|'.join(reversed(alternatives))) if alternatives else None
+
+        return combine(file_alternatives), combine(dir_alternatives), negated_groups
+
+    def _parse_rule(self, line: str) -> Optional[Tuple[str, bool, bool]]:
+        """Parse one gitignore line into (regex, negated, directory only), or None for blanks and comments."""
+        line = line.rstrip('\r\n')
+        # Trailing spaces are ignored unless escaped with a backslash
+        while line.endswith(' ') and not line.endswith('\\ '):
+            line = line[:-1]
+        if not line or line.startswith('#'):
+            return None
+
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        if dir_only:
+            line = line.rstrip('/')
+        if not line:
+            return None
+
+        # A slash at the beginning or in the middle anchors the pattern to the ignore file's directory
+        anchored = '/' in line
+        if line.startswith('/'):
+            line = line[1:]
+
+        regex = self._translate(line)
+        if not anchored:
+            regex = '(?:.*/)?' + regex
+        return regex, negated, dir_only
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """Translate a gitignore glob into a regex matched against a full relative path."""
+        out = []
+        i, n = 0, len(pattern)
+        while i < n:
+            c = pattern[i]
+            if c == '*':
+                j = i
+                while j < n and pattern[j] == '*':
+                    j += 1
+                # ** is only special as a whole path segment
+                if j - i == 2 and (i == 0 or pattern[i - 1] == '/') and (j == n or pattern[j] == '/'):
+                    if j == n:
+                        out.append('.*')            # trailing /**: everything inside
+                    else:
+                        out.append('(?:.*/)?')      # **/: zero or more directories
+                        j += 1
+                else:
+                    out.append('[^/]*')
+                i = j
+                continue
+            if c == '?':
+                out.append('[^/]')
+            elif c == '[':
+                j = i + 1
+                if j < n and pattern[j] in '!^':
+                    j += 1
+                if j < n and pattern[j] == ']':
+                    j += 1
+                while j < n and pattern[j] != ']':
+                    j += 1
+                if j >= n:
+                    out.append(re.escape(c))
+                else:
+                    body = pattern[i + 1:j]
+                    if body[0] in '!^':
+                        body = '^' + body[1:]
+                    out.append('(?!/)[' + body + ']')
+                    i = j + 1
+                    continue
+            elif c == '\\' and i + 1 < n:
+                i += 1
+                out.append(re.escape(pattern[i]))
+            else:
+                out.append(re.escape(c))
+            i += 1
+        return ''.join(out)
+
+    def _scope(self, directory: str) -> Optional[Tuple[Optional[re.Pattern], Optional[re.Pattern], Set[str]]]:
+        """Return the compiled rules of a directory's .gitignore (loaded once)."""
+        if directory not in self._scopes:
+            gitignore_path = self.project_root / directory / '.gitignore'
+            self._scopes[directory] = self._compile(self._read_lines(gitignore_path), str(gitignore_path))
+        return self._scopes[directory]
+
+    def _match(self, rel_path: str, is_dir: bool) -> bool:
+        """Evaluate the rules for a path whose parent directory is known not to be ignored."""
+        parent, _, _ = rel_path.rpartition('/')
+        directories = [parent]
+        while parent:
+            parent = parent.rpartition('/')[0]
+            directories.append(parent)
+
+        # Deeper .gitignore files take precedence over the ones above them
+        scopes = [(directory, self._scope(directory)) for directory in directories]
+        scopes.extend(('', scope) for scope in self._fallback_scopes)
+
+        for directory, scope in scopes:
+            if scope is None:
+                continue
+            regex = scope[1] if is_dir else scope[0]
+            if regex is None:
+                continue
+            match = regex.fullmatch(rel_path[len(directory) + 1:] if directory else rel_path)
+            if match:
+                return match.lastgroup not in scope[2]
+        return False
+
+    def is_dir_ignored(self, rel_dir: str) -> bool:
+        """Check if a directory (relative posix path) is ignored, memoizing the verdict."""
+        verdict = self._dir_verdicts.get(rel_dir)
+        if verdict is None:
+            parent = rel_dir.rpartition('/')[0]
+            # Nothing inside an ignored directory can be re-included
+            verdict = self.is_dir_ignored(parent) or self._match(rel_dir, True)
+            self._dir_verdicts[rel_dir] = verdict
+        return verdict
+
+    def is_ignored_relative(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check if a path given relative to the project root (posix separators) is ignored."""
+        if is_dir:
+            return self.is_dir_ignored(rel_path)
+        parent = rel_path.rpartition('/')[0]
+        return self.is_dir_ignored(parent) or self._match(rel_path, False)
+
+    def is_ignored(self, file_path: Path, is_dir: Optional[bool] = None) -> bool:
+        """
+        Check if a file or directory should be ignored.
+
+        :param file_path: The path to check
+        :param is_dir: Whether the path is a directory; looked up on disk if not given
+        """
+        try:
+            rel_path = file_path.relative_to(self.project_root).as_posix()
+        except ValueError:
+            # File is outside project root
+            return False
+
+        if rel_path == '.':
+            return False
+        if is_dir is None:
+            is_dir = file_path.is_dir()
+        return self.is_ignored_relative(rel_path, is_dir)
+
+
+class FileEntry(NamedTuple):
+    """A file found by WorkspaceWalker."""
+    path: Path        # project_root / rel_path (not resolved)
+    rel_path: str     # Relative to the project root, with '/' separators
+    size: int
+    mtime_ns: int
+    suffix: str       # Lower-cased extension including the dot, '' if none
+    is_symlink: bool
+
+
+class WorkspaceWalker:
+    """
+    Walks the project once with os.scandir, pruning gitignored directories, and caches the file inventory.
+
+    Each ImportTracer walks with its own walker and publishes it through get_workspace_walker(), so the
+helpers that run alongside a tracer (entry point detection and selection) reuse its walk.
+    """
+
+    def __init__(self, project_root: Path, gitignore: Optional[GitignoreParser] = None):
+        """
+        Initialize the WorkspaceWalker.
+
+        :param project_root: The root directory of the project
+        :param gitignore: Matcher used to prune the walk (created for the root if not given)
+        """
+        self.project_root = project_root
+        self.gitignore = gitignore or GitignoreParser(project_root)
+        self._files: Optional[List[FileEntry]] = None
+
+    def _walk(self) -> List[FileEntry]:
+        files: List[FileEntry] = []
+        root_str = str(self.project_root)
+        # (absolute directory, relative posix directory)
+        stack: List[Tuple[str, str]] = [(root_str, '')]
+
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+
+                if is_dir:
+                    # Like os.walk, symlinked directories are not followed
+                    if not entry.is_symlink() and not self.gitignore.is_ignored_relative(rel_path, is_dir=True):
+                        subdirs.append((entry.path, rel_path))
+                    continue
+
+                if self.gitignore.is_ignored_relative(rel_path, is_dir=False):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                suffix = os.path.splitext(entry.name)[1].lower()
+                files.append(FileEntry(
+                    self.project_root / rel_path, rel_path, st.st_size, st.st_mtime_ns, suffix, entry.is_symlink()
+                ))
+
+            # Reversed so the stack pops subdirectories in name order
+            stack.extend(reversed(subdirs))
+
+        return files
+
+    def files(self, refresh: bool = False) -> List[FileEntry]:
+        """Return all non-ignored files, walking the disk only on first use or when refresh is set."""
+        if refresh:
+            self.refresh()
+        if self._files is None:
+            self._files = self._walk()
+        return self._files
+
+    def python_files(self, refresh: bool = False) -> List[FileEntry]:
+        """Return all non-ignored .py files."""
+        return [entry for entry in self.files(refresh) if entry.suffix == '.py']
+
+    def refresh(self, ignore_rules: bool = True):
+        """
+        Forget the cached inventory so the next call walks the disk again.
+
+        :param ignore_rules: Whether to also reread the .gitignore files (the parser memoizes them and
+                             its directory verdicts), or only the file inventory
+        """
+        self._files = None
+        if ignore_rules:
+            self.gitignore = GitignoreParser(self.project_root)
 
-    def _load_gitignore(self):
-        """Load patterns from .gitignore file."""
-        gitignore_path = self.project_root / '.gitignore'
-        if not gitignore_path.exists():
+
+_workspace_walkers: Dict[Path, WorkspaceWalker] = {}
+
+
+def get_workspace_walker(project_root: Path) -> WorkspaceWalker:
+    """Return the walker of the most recent ImportTracer for a project root (or a new one, if there is none)."""
+    walker = _workspace_walkers.get(project_root)
+    if walker is None:
+        walker = WorkspaceWalker(project_root)
+        _workspace_walkers[project_root] = walker
+    return walker
+
+
+class ParsedFile(NamedTuple):
+    """What is kept of a parsed file; the syntax tree itself is discarded right after parsing."""
+    imports: List[str]  # Dotted names that may refer to project modules
+    symbols: Dict[str, List[str]]  # Imported module -> names imported from it ('*' = the whole module)
+    definitions: List[str]  # Top-level functions and classes whose name appears nowhere else in their own file
+
+
+EMPTY_PARSED_FILE = ParsedFile([], {}, [])
+
+
+class ImportCache:
+    """Persistent on-disk cache of parsed imports, keyed by file path and stat signature."""
+
+    FILENAME = '.depcache'
+    # Bump whenever the stored import format or the extraction logic changes
+    VERSION = 4
+    # Files modified this recently when they were read are always re-validated (by hash, or by reparsing)
+    RACY_NS = 2_000_000_000
+
+    def __init__(self, project_root: Path, use_hash: bool = False, persistent: bool = True):
+        """
+        Initialize the ImportCache and load existing entries.
+
+        :param project_root: The root directory of the project (the cache file lives here)
+        :param use_hash: Whether to store content hashes, so files whose mtime changed
+                         but whose content did not (e.g. after a checkout) are not reparsed
+        :param persistent: Whether to read and write the cache file; if False the cache only lives in memory
+        """
+        self.project_root = project_root
+        self.cache_path = project_root / self.FILENAME
+        self.use_hash = use_hash
+        self.persistent = persistent
+        # relative posix path -> (mtime_ns, size, content hash or None, parsed file)
+        self.entries: Dict[str, Tuple[int, int, Optional[str], ParsedFile]] = {}
+        self._dirty: Set[str] = set()
+        self._stale: Set[str] = set()
+        if persistent:
+            self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.cache_path))
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version != self.VERSION:
+            conn.execute('DROP TABLE IF EXISTS files')
+            conn.execute(f'PRAGMA user_version = {self.VERSION}')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS files ('
+            'path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, hash TEXT, parsed TEXT)'
+        )
+        return conn
+
+    def _load(self):
+        """Load all cache entries into memory."""
+        if not self.cache_path.exists():
             return
 
         try:
-            with open(gitignore_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    # Skip empty lines and comments
-                    if not line or line.startswith('#'):
-                        continue
-
-                    # Handle negation patterns (not fully implemented)
-                    if line.startswith('!'):
-                        continue
-
-                    # Convert gitignore pattern to regex
-                    pattern = line
-
-                    # Handle directory patterns
-                    if pattern.endswith('/'):
-                        pattern = pattern[:-1] + '/**'
-
-                    # Convert to regex pattern
-                    regex_pattern = self._gitignore_to_regex(pattern)
-                    self.patterns.append(regex_pattern)
-                    if self.debug:
-                        print(f"Added gitignore pattern: {pattern} -> {regex_pattern.pattern}", file=sys.stderr)
+            conn = self._connect()
+            try:
+                for path, mtime_ns, size, content_hash, parsed in conn.execute(
+                    'SELECT path, mtime_ns, size, hash, parsed FROM files'
+                ):
+                    self.entries[path] = (mtime_ns, size, content_hash, ParsedFile(*json.loads(parsed)))
+            finally:
+                conn.close()
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            print(f"Warning: Could not read import cache {self.cache_path}: {e}", file=sys.stderr)
+            self.entries = {}
+
+    def _key(self, file_path: Path) -> str:
+        return file_path.relative_to(self.project_root).as_posix()
+
+    @staticmethod
+    def hash_content(content: bytes) -> str:
+        """Return the content hash stored alongside cache entries."""
+        return hashlib.sha1(content).hexdigest()
+
+    def get(self, file_path: Path) -> Optional[ParsedFile]:
+        """Return the cached parse result for a file, or None if the file changed since it was cached."""
+        try:
+            key = self._key(file_path)
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            st = file_path.stat()
+        except (ValueError, OSError):
+            return None
+
+        mtime_ns, size, content_hash, parsed = entry
+        if st.st_mtime_ns == mtime_ns and st.st_size == size:
+            return parsed
+
+        if self.use_hash and content_hash is not None and st.st_size == size:
+            try:
+                content = file_path.read_bytes()
+            except OSError:
+                return None
+            if self.hash_content(content) == content_hash:
+                # Content is unchanged, only refresh the stat signature
+                self.entries[key] = (self._trusted_mtime(st), st.st_size, content_hash, parsed)
+                self._dirty.add(key)
+                return parsed
+
+        return None
+
+    def _trusted_mtime(self, st: os.stat_result) -> int:
+        """Return the mtime to store for a file, or 0 if it could still change within the same mtime tick."""
+        if time.time_ns() - st.st_mtime_ns < self.RACY_NS:
+            return 0
+        return st.st_mtime_ns
+
+    def put(self, file_path: Path, st: os.stat_result, parsed: ParsedFile, content_hash: Optional[str] = None):
+        """Store the parse result of a file, as of the given stat (taken before the file was read)."""
+        try:
+            key = self._key(file_path)
+        except ValueError:
+            return
 
-        except Exception as e:
-            print(f"Warning: Could not parse .gitignore: {e}", file=sys.stderr)
-
-    def _gitignore_to_regex(self, pattern: str) -> re.Pattern:
-        """Convert gitignore pattern to regex."""
-        # Handle directory patterns first
-        is_directory = pattern.endswith('/')
-        if is_directory:
-            pattern = pattern[:-1]
-
-        # Escape special regex characters except * and ?
-        escaped = re.escape(pattern)
-        escaped = escaped.replace(r'\*\*', '🌟🌟')  # Temporary placeholder for **
-        escaped = escaped.replace(r'\*', '🌟')      # Temporary placeholder for *
-        escaped = escaped.replace(r'\?', '❓')      # Temporary placeholder for ?
-
-        # Replace placeholders with proper regex
-        escaped = escaped.replace('🌟🌟', '.*')     # ** matches everything including /
-        escaped = escaped.replace('🌟', '[^/]*')   # * matches anything except /
-        escaped = escaped.replace('❓', '.')        # ? matches single character
-
-        # Handle different pattern types
-        if pattern.startswith('/'):
-            # Absolute pattern from root
-            regex_pattern = '^' + escaped[1:] + ('(/.*)?$' if is_directory else '$')
-        else:
-            # Pattern can match at any level
-            if is_directory:
-                regex_pattern = '(^|.*/)' + escaped + '(/.*)?$'
-            else:
-                regex_pattern = '(^|.*/)' + escaped + '$'
+        self.entries[key] = (self._trusted_mtime(st), st.st_size, content_hash, parsed)
+        self._dirty.add(key)
+
+    def evict_missing(self, live_files: Set[Path]):
+        """Drop entries for files that are no longer part of the project (deleted or now ignored)."""
+        live_keys = set()
+        for file_path in live_files:
+            try:
+                live_keys.add(self._key(file_path))
+            except ValueError:
+                continue
+
+        for key in [key for key in self.entries if key not in live_keys]:
+            del self.entries[key]
+            self._dirty.discard(key)
+            self._stale.add(key)
 
-        return re.compile(regex_pattern)
+    def save(self):
+        """Write changed and evicted entries to disk."""
+        if not self.persistent or (not self._dirty and not self._stale):
+            self._dirty.clear()
+            self._stale.clear()
+            return
 
-    def is_ignored(self, file_path: Path) -> bool:
-        """Check if a file should be ignored."""
         try:
-            relative_path = file_path.relative_to(self.project_root)
-            path_str = str(relative_path.as_posix())
-
-            # Check if the file itself matches any pattern
-            for pattern in self.patterns:
-                if pattern.match(path_str):
-                    return True
-
-            # Check if any parent directory matches a directory pattern
-            current_path = relative_path
-            while current_path != Path('.'):
-                current_str = str(current_path.as_posix())
-                for pattern in self.patterns:
-                    if pattern.match(current_str):
-                        return True
-                current_path = current_path.parent
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany('DELETE FROM files WHERE path = ?', [(key,) for key in sorted(self._stale)])
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO files (path, mtime_ns, size, hash, parsed) VALUES (?, ?, ?, ?, ?)',
+                        [
+                            (key, *self.entries[key][:3], json.dumps(self.entries[key][3]))
+                            for key in sorted(self._dirty)
+                        ]
+                    )
+            finally:
+                conn.close()
+            self._dirty.clear()
+            self._stale.clear()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not write import cache {self.cache_path}: {e}", file=sys.stderr)
+
+
+_IDENTIFIER_PATTERN = re.compile(r'\w+')
+
+
+class _ImportRecorder:
+    """Collects the imports and imported names of one file, from AST nodes or from tokens."""
+
+    def __init__(self, file_path: Path, project_root: Path):
+        self.file_path = file_path
+        self.project_root = project_root
+        self.imports: List[str] = []
+        self.symbols: Dict[str, List[str]] = defaultdict(list)
+
+    def add_import(self, names: List[str]):
+        """Record "import a.b, c"."""
+        for name in names:
+            self.imports.append(name)
+            # The whole module is reachable through its name
+            self.symbols[name].append('*')
+
+    def add_import_from(self, module: Optional[str], names: List[str], level: int):
+        """Record "from module import names" (with level leading dots)."""
+        # Handle the module part of "from module import ..."
+        # This module needs to be resolved to its file.
+        module_source_to_register = None
+        if level == 0:  # Absolute import: from X.Y import Z
+            if module:
+                module_source_to_register = module  # X.Y
+                # Z may itself be a submodule (X/Y/Z.py); only resolves if such a file exists
+                for name in names:
+                    if name != '*':
+                        self.imports.append(f"{module}.{name}")
+                    self.symbols[module].append(name)
+        else:  # Relative import: from .X import Y or ..X import Y
+            current_pkg_path_parts = []
+            # Determine current package path relative to project_root
+            if self.file_path.is_relative_to(self.project_root):
+                current_pkg_path_parts = list(self.file_path.parent.relative_to(self.project_root).parts)
+
+            # Calculate effective base parts for the import
+            # e.g. current is proj/src/a/b/c.py -> current_pkg_path_parts = (src,a,b)
+            # level 1 (.X) -> base is (src,a,b)
+            # level 2 (..X) -> base is (src,a)
+            if level > 0 and (level <= len(current_pkg_path_parts) + 1 if current_pkg_path_parts else level ==1) :
+                if level == 1:
+                    effective_base_parts = current_pkg_path_parts
+                else: # level > 1
+                    effective_base_parts = current_pkg_path_parts[:-(level - 1)]
+
+                base_package_str = '.'.join(effective_base_parts)
+                if module:  # from .sibling_module import ...
+                    module_source_to_register = f"{base_package_str}.{module}"
+                    self.symbols[module_source_to_register].extend(names)
+                else:  # from . import name1, name2 ...
+                    # Each name in names is a module relative to base_package_str
+                    for name in names:
+                        self.imports.append(f"{base_package_str}.{name}")
+                    # ... or a name defined in the package's __init__.py
+                    self.symbols[base_package_str].extend(names)
+                    # module_source_to_register remains None, items handled individually
+            # else: relative import goes beyond project root or file not in project
+
+        if module_source_to_register:
+            self.imports.append(module_source_to_register)
+
+    def parsed_file(self, definitions: List[str], content: bytes) -> ParsedFile:
+        return ParsedFile(
+            self.imports,
+            {module: sorted(set(names)) for module, names in self.symbols.items()},
+            _unreferenced_definitions(definitions, content)
+        )
 
-        except ValueError:
-            # File is outside project root
-            pass
 
-        return False
+class _ImportVisitor(ast.NodeVisitor):
+    """Visits imports and the statement bodies that may contain them, never expressions."""
+
+    BODY_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
+    def __init__(self, recorder: _ImportRecorder):
+        self.recorder = recorder
+
+    def visit_Import(self, node: ast.Import):
+        self.recorder.add_import([alias.name for alias in node.names])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        self.recorder.add_import_from(node.module, [alias.name for alias in node.names], node.level)
+
+    def generic_visit(self, node: ast.AST):
+        for field in self.BODY_FIELDS:
+            for child in getattr(node, field, ()):
+                self.visit(child)
+
+
+def _unreferenced_definitions(definitions: List[str], content: bytes) -> List[str]:
+    """Return the definitions whose name occurs only once (in the definition itself) in the file."""
+    if not definitions:
+        return []
+
+    names = set(definitions)
+    occurrences: Dict[str, int] = defaultdict(int)
+    for word in _IDENTIFIER_PATTERN.findall(content.decode('utf-8', errors='replace')):
+        if word in names:
+            occurrences[word] += 1
+    return [name for name in definitions if occurrences[name] <= 1]
+
+
+def _split_import_names(tokens: List[str]) -> List[str]:
+    """Split the tokens after "import" into the imported names, dropping parentheses and "as" aliases."""
+    names = []
+    for part in ' '.join(token for token in tokens if token not in ('(', ')')).split(','):
+        words = part.split()
+        if words:
+            names.append(''.join(words[:words.index('as')] if 'as' in words else words))
+    return names
+
+
+# Indented import statements: such files go straight to the AST instead of being tokenized first
+_NESTED_IMPORT_PATTERN = re.compile(rb'^[ \t]+(?:import[ \t]+[\w.]|from[ \t]+[\w.]+[ \t]+import\b)', re.MULTILINE)
+
+
+def _tokenize_imports(content: bytes, recorder: _ImportRecorder) -> Optional[List[str]]:
+    """
+    Tokenizer fast path: record the top-level imports of a file without building a syntax tree.
+
+    Only handles files whose imports are all plain module-level statements; does not validate syntax.
+
+    :param content: The file contents
+    :param recorder: Receives the imports
+    :return: The top-level function and class names, or None if the file needs the AST
+             (an import inside a block or after another statement on the same line, or a tokenizer error)
+    """
+    definitions: List[str] = []
+    statement: Optional[List[str]] = None  # Tokens of the import statement being read
+    at_start = True
+    indent = 0
+    expect_name = False
+
+    try:
+        for token in tokenize.tokenize(io.BytesIO(content).readline):
+            kind, string = token.type, token.string
+            if statement is not None:
+                if kind in (tokenize.NEWLINE, tokenize.ENDMARKER) or string == ';':
+                    if statement[0] == 'import':
+                        recorder.add_import(_split_import_names(statement[1:]))
+                    else:
+                        split = statement.index('import')
+                        head = statement[1:split]
+                        dots = 0
+                        while dots < len(head) and head[dots] in ('.', '...'):
+                            dots += 1
+                        level = sum(len(dot) for dot in head[:dots])
+                        module = ''.join(head[dots:]) or None
+                        recorder.add_import_from(module, _split_import_names(statement[split + 1:]), level)
+                    statement = None
+                    at_start = True
+                elif kind in (tokenize.NAME, tokenize.OP):
+                    statement.append(string)
+                continue
+
+            if kind == tokenize.INDENT:
+                indent += 1
+            elif kind == tokenize.DEDENT:
+                indent -= 1
+            elif kind == tokenize.NEWLINE or string == ';':
+                at_start = True
+            elif kind == tokenize.NAME:
+                if expect_name:
+                    definitions.append(string)
+                    expect_name = False
+                elif string == 'import' or (string == 'from' and at_start):
+                    if not at_start or indent:
+                        return None
+                    statement = [string]
+                elif at_start and not indent and string in ('def', 'class'):
+                    expect_name = True
+                # "async def" still starts a definition
+                at_start = at_start and string == 'async'
+            elif kind not in (tokenize.NL, tokenize.COMMENT, tokenize.ENCODING):
+                at_start = False
+    except (tokenize.TokenError, SyntaxError):
+        return None
+
+    return definitions
+
+
+def extract_imports(
+    file_path: Path,
+    project_root: Path,
+    want_hash: bool = False,
+    fast: bool = False
+) -> Optional[Tuple[ParsedFile, Optional[str], os.stat_result]]:
+    """
+    Parse a Python file and extract all imports.
+
+    Kept at module level so it can run in worker processes; returns only compact import lists.
+    The visitor only descends into statement bodies, so expressions are never visited, and the
+    syntax tree is dropped before the result is built. The same pass also records the names
+    imported by each "from ... import" and the top-level definitions of the file, so symbol-level
+    analysis never needs a second parse.
+
+    :param file_path: The file to parse
+    :param project_root: The project root, used to resolve relative imports to dotted names
+    :param want_hash: Whether to also return a content hash for the import cache
+    :param fast: Whether to try the tokenizer fast path first (falls back to the AST when the file
+                 has imports inside blocks)
+    :return: (parsed file, content hash or None, stat of the file taken before it was read),
+             or None if the file could not be read
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            content = f.read()
+    except OSError as e:
+        print(f"Warning: Could not parse {file_path}: {e}", file=sys.stderr)
+        return None
+
+    recorder = _ImportRecorder(file_path, project_root)
+    definitions = None
+    if fast and not _NESTED_IMPORT_PATTERN.search(content):
+        definitions = _tokenize_imports(content, recorder)
+
+    if definitions is None:
+        recorder = _ImportRecorder(file_path, project_root)
+        definitions = []
+        try:
+            tree = ast.parse(content)
+            definitions = [
+                node.name for node in tree.body
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+            ]
+            _ImportVisitor(recorder).visit(tree)
+            del tree
+        except Exception as e:
+            print(f"Warning: Could not parse {file_path}: {e}", file=sys.stderr)
+
+    parsed = recorder.parsed_file(definitions, content)
+    return parsed, (ImportCache.hash_content(content) if want_hash else None), st
+
+
+class FileTable:
+    """Interns file paths to dense integer ids, so graphs can be stored as integer arrays."""
+
+    def __init__(self):
+        self.paths: List[Path] = []
+        self.ids: Dict[Path, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def intern(self, file_path: Path) -> int:
+        """Return the id of a path, assigning the next free id on first use."""
+        file_id = self.ids.get(file_path)
+        if file_id is None:
+            file_id = self.ids[file_path] = len(self.paths)
+            self.paths.append(file_path)
+        return file_id
+
+
+class CompactGraph:
+    """
+    Immutable adjacency in CSR form: the successors of node i are targets[offsets[i]:offsets[i + 1]].
+
+    The reverse (importer) edges are stored the same way, as the transpose of the forward edges.
+    """
+
+    def __init__(self, node_count: int, out_edges: Dict[int, array]):
+        """
+        :param node_count: Number of node ids (ids range over 0..node_count - 1)
+        :param out_edges: Sorted successor ids per node; missing nodes have no successors
+        """
+        self.node_count = node_count
+        self.offsets, self.targets = self._pack(node_count, out_edges)
+
+        in_edges: Dict[int, array] = defaultdict(lambda: array('i'))
+        for source in range(node_count):
+            for target in self.targets[self.offsets[source]:self.offsets[source + 1]]:
+                in_edges[target].append(source)
+        self.reverse_offsets, self.reverse_targets = self._pack(node_count, in_edges)
+
+    @staticmethod
+    def _pack(node_count: int, edges: Dict[int, array]) -> Tuple[array, array]:
+        offsets = array('i', [0]) * (node_count + 1)
+        targets = array('i')
+        for node in range(node_count):
+            node_edges = edges.get(node)
+            if node_edges:
+                targets.extend(node_edges)
+            offsets[node + 1] = len(targets)
+        return offsets, targets
+
+    def successors(self, node: int) -> array:
+        """Ids imported by a node."""
+        if node >= self.node_count:
+            return array('i')
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def predecessors(self, node: int) -> array:
+        """Ids importing a node."""
+        if node >= self.node_count:
+            return array('i')
+        return self.reverse_targets[self.reverse_offsets[node]:self.reverse_offsets[node + 1]]
+
+
+@lru_cache(maxsize=None)
+def known_external_modules() -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """
+    Return the top-level module names of the standard library and of the installed distributions.
+
+    Computed once per interpreter process, and only when external imports are classified.
+    """
+    stdlib = set(getattr(sys, 'stdlib_module_names', ())) | set(sys.builtin_module_names)
+    try:
+        import importlib.metadata
+        installed = set(importlib.metadata.packages_distributions())
+    except (ImportError, AttributeError):  # Python < 3.10
+        installed = set()
+    return frozenset(stdlib), frozenset(installed - stdlib)
+
+
+def classify_external_module(name: str) -> str:
+    """Return "stdlib", "third-party" (installed in this interpreter) or "unknown" for a top-level module name."""
+    stdlib, installed = known_external_modules()
+    if name in stdlib:
+        return 'stdlib'
+    if name in installed:
+        return 'third-party'
+    return 'unknown'
+
+
+class Traversal(NamedTuple):
+    """Result of a bounded breadth-first traversal of the imports of an entry point."""
+    files: Set[Path]  # Every file reached, including the entry point
+    graph: Dict[Path, Set[Path]]  # File -> direct imports, for every followed file that has imports
+    depths: Dict[Path, int]  # File -> BFS depth (0 for the entry point)
+    truncated: Set[Path]  # Files within max_depth whose imports were not followed because of max_nodes
+    max_depth: int
+
+    @property
+    def expanded(self) -> Set[Path]:
+        """Files whose imports were followed."""
+        return {
+            file_path for file_path, depth in self.depths.items()
+            if depth < self.max_depth and file_path not in self.truncated
+        }
 
 
 class ImportTracer:
     """Traces all imports starting from entry points to find used files."""
 
-    def __init__(self, project_root: Path):
+    # Number of parsed files between two progress events of build_dependency_graph
+    PROGRESS_INTERVAL = 100
+    # Number of files parsed (in parallel) at a time by whole-project passes like unused_definitions
+    PARSE_CHUNK = 512
+
+    def __init__(
+        self,
+        project_root: Path,
+        use_cache: bool = False,
+        cache_hash: bool = False,
+        jobs: int = 1,
+        persist_cache: bool = True,
+        fast_parse: bool = False
+    ):
+        """
+        Initialize the ImportTracer.
+
+        :param project_root: The root directory of the project
+        :param use_cache: Whether to cache parsed imports (validated by file mtime and size)
+        :param cache_hash: Whether the cache should also validate files by content hash
+        :param jobs: Number of worker processes used to parse files (1 = parse serially)
+        :param persist_cache: Whether the cache is stored in .depcache under the project root,
+                              or only kept in memory (useful for long-lived processes)
+        :param fast_parse: Whether to read the imports of files without nested imports with the tokenizer
+        """
         self.project_root = project_root
-        self.gitignore = GitignoreParser(project_root)
+        # A new tracer always walks the disk afresh, then shares its walk with the helpers that run after it
+        self.walker = WorkspaceWalker(project_root)
+        _workspace_walkers[project_root] = self.walker
         self.used_files: Dict[str, Set[Path]] = defaultdict(set)
         self.all_python_files: Set[Path] = set()
+        self.cache: Optional[ImportCache] = (
+            ImportCache(project_root, use_hash=cache_hash, persistent=persist_cache) if use_cache else None
+        )
+        self.jobs = max(1, jobs)
+        self.fast_parse = fast_parse
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Files parsed ahead of the BFS by the worker pool, consumed by _parse_file
+        self._prefetched: Dict[Path, ParsedFile] = {}
+
+        # Global import graph over all project files, built on demand by build_global_graph()
+        self.global_graph_built = False
+        # Files are interned to ids; each file's direct imports are a sorted array of ids, and
+        # traversals run on a CSR snapshot of those arrays that is rebuilt lazily after changes
+        self.files = FileTable()
+        self._out_edges: Dict[int, array] = {}
+        self._compact: Optional[CompactGraph] = None
+        self._file_imports: Dict[Path, List[str]] = {}
+        self._importers_by_name: Dict[str, Set[Path]] = defaultdict(set)
+        # (entry point, max depth, max nodes) -> result of traverse(), invalidated by update()
+        self._graph_results: Dict[Tuple[Path, int, Optional[int]], Traversal] = {}
+
+        self.module_index: Dict[str, Set[Path]] = defaultdict(set)
+        # Number of module_index names per top-level package; imports of any other top-level name are external
+        self._top_level_names: Dict[str, int] = defaultdict(int)
+        # Top-level names of the external imports of each resolved file
+        self._external_imports: Dict[Path, Set[str]] = {}
+
         self._find_all_python_files()
+        if self.cache is not None:
+            self.cache.evict_missing(self.all_python_files)
+
+    @property
+    def gitignore(self) -> GitignoreParser:
+        """The ignore rules of the shared walker (replaced whenever the walker is refreshed)."""
+        return self.walker.gitignore
+
+    def python_file_stats(self, refresh: bool = False) -> Dict[Path, Tuple[int, int]]:
+        """Return (mtime_ns, size) for every Python file in the project, keyed by resolved path."""
+        canonical_root = self.project_root.resolve() == self.project_root
+        return {
+            entry.path if canonical_root and not entry.is_symlink else entry.path.resolve(): (entry.mtime_ns, entry.size)
+            for entry in self.walker.python_files(refresh)
+        }
+
+    def _scan_python_files(self, refresh: bool = False) -> Set[Path]:
+        """Return all Python files in the project (resolved), respecting .gitignore."""
+        return set(self.python_file_stats(refresh))
 
     def _find_all_python_files(self):
         """Find all Python files in the project, respecting .gitignore."""
-        def should_explore_directory(dir_path: Path) -> bool:
-            """Check if we should explore a directory (not gitignored)."""
-            return not self.gitignore.is_ignored(dir_path)
-
-        for root, dirs, files in os.walk(self.project_root):
-            root_path = Path(root)
-
-            # Filter out directories that should be ignored
-            dirs[:] = [d for d in dirs if should_explore_directory(root_path / d)]
+        self.all_python_files = self._scan_python_files()
+        self._build_module_index()
+
+    def _parse_file(self, file_path: Path) -> ParsedFile:
+        """Parse a Python file (or take it from the prefetched results or the cache)."""
+        prefetched = self._prefetched.pop(file_path, None)
+        if prefetched is not None:
+            return prefetched
+
+        if self.cache is not None:
+            cached = self.cache.get(file_path)
+            if cached is not None:
+                return cached
+
+        result = extract_imports(
+            file_path, self.project_root, want_hash=self.cache is not None and self.cache.use_hash, fast=self.fast_parse
+        )
+        if result is None:
+            return EMPTY_PARSED_FILE
 
-            # Process Python files in current directory
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = root_path / file
-                    # Only add if not gitignored
-                    if not self.gitignore.is_ignored(file_path):
-                        self.all_python_files.add(file_path.resolve())
+        parsed, content_hash, st = result
+        if self.cache is not None:
+            self.cache.put(file_path, st, parsed, content_hash)
+        return parsed
 
     def _parse_imports(self, file_path: Path) -> List[str]:
         """Parse a Python file and extract all imports."""
-        imports = []
+        return self._parse_file(file_path).imports
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            tree = ast.parse(content)
+    def _prefetch_imports(self, files: List[Path]):
+        """Parse a batch of files in the process pool so the BFS can consume them without waiting."""
+        pending: List[Path] = []
+        for file_path in files:
+            if file_path in self._prefetched:
+                continue
+            cached = self.cache.get(file_path) if self.cache is not None else None
+            if cached is not None:
+                self._prefetched[file_path] = cached
+            elif file_path not in pending:
+                pending.append(file_path)
 
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-                elif isinstance(node, ast.ImportFrom):
-                    # Handle the module part of "from module import ..."
-                    # This module needs to be resolved to its file.
-                    module_source_to_register = None
-                    if node.level == 0:  # Absolute import: from X.Y import Z
-                        if node.module:
-                            module_source_to_register = node.module  # X.Y
-                    else:  # Relative import: from .X import Y or ..X import Y
-                        current_pkg_path_parts = []
-                        # Determine current package path relative to project_root
-                        if file_path.is_relative_to(self.project_root):
-                            current_pkg_path_parts = list(file_path.parent.relative_to(self.project_root).parts)
-
-                        # Calculate effective base parts for the import
-                        # e.g. current is proj/src/a/b/c.py -> current_pkg_path_parts = (src,a,b)
-                        # level 1 (.X) -> base is (src,a,b)
-                        # level 2 (..X) -> base is (src,a)
-                        if node.level > 0 and (node.level <= len(current_pkg_path_parts) + 1 if current_pkg_path_parts else node.level ==1) :
-                            if node.level == 1:
-                                effective_base_parts = current_pkg_path_parts
-                            else: # node.level > 1
-                                effective_base_parts = current_pkg_path_parts[:-(node.level - 1)]
-
-                            base_package_str = '.'.join(effective_base_parts)
-                            if node.module:  # from .sibling_module import ...
-                                module_source_to_register = f"{base_package_str}.{node.module}"
-                            else:  # from . import name1, name2 ...
-                                # Each name in node.names is a module relative to base_package_str
-                                for alias in node.names:
-                                    imports.append(f"{base_package_str}.{alias.name}")
-                                # module_source_to_register remains None, items handled individually
-                        # else: relative import goes beyond project root or file not in project
-
-                    if module_source_to_register:
-                        imports.append(module_source_to_register)
+        if len(pending) < 2:
+            return
 
-        except Exception as e:
-            print(f"Warning: Could not parse {file_path}: {e}", file=sys.stderr)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.jobs)
 
-        return imports
+        want_hash = self.cache is not None and self.cache.use_hash
+        chunksize = max(1, len(pending) // (self.jobs * 4))
+        results = self._executor.map(
+            extract_imports, pending, repeat(self.project_root), repeat(want_hash), repeat(self.fast_parse),
+            chunksize=chunksize
+        )
+        for file_path, result in zip(pending, results):
+            if result is None:
+                self._prefetched[file_path] = EMPTY_PARSED_FILE
+                continue
+            parsed, content_hash, st = result
+            self._prefetched[file_path] = parsed
+            if self.cache is not None:
+                self.cache.put(file_path, st, parsed, content_hash)
+
+    def close(self):
+        """Persist the import cache and shut down the worker pool, if any."""
+        self.save_cache()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def save_cache(self):
+        """Persist the import cache."""
+        if self.cache is not None:
+            self.cache.save()
+
+    def _build_module_index(self):
+        """Map every dotted module name in the project to the files it can refer to."""
+        self.module_index = defaultdict(set)
+        self._top_level_names = defaultdict(int)
+        for file_path in self.all_python_files:
+            self._index_file(file_path)
+
+    def _index_file(self, file_path: Path):
+        """Add a file to the module index."""
+        for module_name in self._module_names_for_file(file_path):
+            if module_name not in self.module_index:
+                self._top_level_names[module_name.split('.', 1)[0]] += 1
+            self.module_index[module_name].add(file_path)
+
+    def _unindex_file(self, file_path: Path):
+        """Remove a file from the module index."""
+        for module_name in self._module_names_for_file(file_path):
+            self.module_index[module_name].discard(file_path)
+            if not self.module_index[module_name]:
+                del self.module_index[module_name]
+                top_level = module_name.split('.', 1)[0]
+                self._top_level_names[top_level] -= 1
+                if not self._top_level_names[top_level]:
+                    del self._top_level_names[top_level]
 
     def _resolve_import_to_file(self, import_name: str, current_file: Path) -> Set[Path]:
         """Resolve an import name to actual file paths, considering project structure."""
-        resolved_files = set()
-        parts = import_name.split('.')
+        # Modules are looked up under src/ (if present) and the project root, as
+        # <name>.py or <name>/__init__.py; the index already holds exactly those files.
+        return self.module_index.get(self._normalize_module_name(import_name)) or set()
+
+    @staticmethod
+    def _normalize_module_name(import_name: str) -> str:
+        """Drop empty parts, which relative imports from the project root produce (e.g. ".module")."""
+        if '..' in f".{import_name}.":
+            return '.'.join(part for part in import_name.split('.') if part)
+        return import_name
+
+    def _resolve_file_imports(self, file_path: Path, imports: List[str]) -> Set[Path]:
+        """Resolve the imports of a file to the project files they refer to."""
+        direct_deps: Set[Path] = set()
+        external: Set[str] = set()
+        for import_name in imports:
+            # Imports whose top-level package does not exist in the project (os, numpy, ...) cannot
+            # resolve to a project file; only their top-level name is kept for external_dependencies()
+            top_level = import_name.split('.', 1)[0]
+            if top_level and top_level not in self._top_level_names:
+                external.add(top_level)
+                continue
+            for resolved_file in self._resolve_import_to_file(import_name, file_path):
+                if resolved_file in self.all_python_files: # Ensure it's a project file
+                    direct_deps.add(resolved_file)
+        if external:
+            self._external_imports[file_path] = external
+        else:
+            self._external_imports.pop(file_path, None)
+        return direct_deps
 
-        # Define potential Python source roots for this project
-        search_roots = []
-        src_dir = self.project_root / "src"
-        if src_dir.is_dir():
-            search_roots.append(src_dir)
-        search_roots.append(self.project_root) # Fallback or for projects without src layout
+    def external_dependencies(self, files: Set[Path]) -> Dict[Path, Set[str]]:
+        """
+        Return the top-level names of the modules outside the project imported by each file.
 
-        for s_root in search_roots:
-            module_path_candidate = s_root.joinpath(*parts)
+        Only files whose imports were resolved (i.e. expanded by a traversal) are included.
+        """
+        return {
+            file_path: self._external_imports[file_path]
+            for file_path in files
+            if file_path in self._external_imports
+        }
 
-            # Check for .py file (e.g., s_root/pkg/module.py)
-            py_file = module_path_candidate.with_suffix('.py')
-            if py_file.exists() and py_file.is_file():
-                if py_file.is_relative_to(self.project_root) and not self.gitignore.is_ignored(py_file):
-                    resolved_files.add(py_file.resolve())
+    def _module_names_for_file(self, file_path: Path) -> Set[str]:
+        """Return the dotted module names under which a project file can be imported."""
+        names: Set[str] = set()
+        for s_root in (self.project_root / 'src', self.project_root):
+            if not file_path.is_relative_to(s_root):
+                continue
+            parts = list(file_path.relative_to(s_root).parts)
+            parts[-1] = parts[-1][:-len('.py')]
+            if parts[-1] == '__init__':
+                parts.pop()
+            # Dotted directory or file names can never be reached by an import statement
+            if parts and not any('.' in part for part in parts):
+                names.add('.'.join(parts))
+        return names
+
+    @property
+    def graph(self) -> CompactGraph:
+        """Compact snapshot of the global graph, indexed by the ids of self.files."""
+        if self._compact is None:
+            self._compact = CompactGraph(len(self.files), self._out_edges)
+        return self._compact
+
+    @property
+    def forward_graph(self) -> Dict[Path, Set[Path]]:
+        """The global graph as file -> files it imports."""
+        paths = self.files.paths
+        return {paths[file_id]: {paths[dep] for dep in deps} for file_id, deps in self._out_edges.items()}
+
+    @property
+    def reverse_graph(self) -> Dict[Path, Set[Path]]:
+        """The global graph as file -> files importing it."""
+        graph = self.graph
+        paths = self.files.paths
+        reverse_graph = {}
+        for file_id in range(graph.node_count):
+            importers = graph.predecessors(file_id)
+            if importers:
+                reverse_graph[paths[file_id]] = {paths[importer] for importer in importers}
+        return reverse_graph
+
+    def _set_file_edges(self, file_path: Path, imports: List[str]):
+        """Replace the outgoing edges of a file in the global graph."""
+        for import_name in self._file_imports.get(file_path, []):
+            import_name = self._normalize_module_name(import_name)
+            importers = self._importers_by_name.get(import_name)
+            if importers is not None:
+                importers.discard(file_path)
+                if not importers:
+                    del self._importers_by_name[import_name]
+
+        direct_deps = self._resolve_file_imports(file_path, imports)
+        self._file_imports[file_path] = imports
+        self._out_edges[self.files.intern(file_path)] = array('i', sorted(self.files.intern(dep) for dep in direct_deps))
+        self._compact = None
+        for import_name in imports:
+            self._importers_by_name[self._normalize_module_name(import_name)].add(file_path)
+
+    def _remove_file(self, file_path: Path):
+        """Remove a file and all its outgoing edges from the global graph."""
+        self._set_file_edges(file_path, [])
+        del self._file_imports[file_path]
+        del self._out_edges[self.files.ids[file_path]]
+
+    def build_global_graph(self):
+        """Parse every project file once and build the forward and reverse import graphs."""
+        files = sorted(self.all_python_files)
+        if self.jobs > 1:
+            self._prefetch_imports(files)
+
+        self.files = FileTable()
+        for file_path in files:
+            self.files.intern(file_path)
+        self._out_edges = {}
+        self._compact = None
+        self._file_imports = {}
+        self._importers_by_name = defaultdict(set)
+        self._graph_results = {}
+
+        for file_path in files:
+            self._set_file_edges(file_path, self._parse_imports(file_path))
+
+        self.global_graph_built = True
+        self.save_cache()
+
+    def update(
+        self,
+        changed_paths: Optional[List[Path]] = None,
+        deleted_paths: Optional[List[Path]] = None,
+        added_paths: Optional[List[Path]] = None
+    ) -> Set[Path]:
+        """
+        Patch the global graph after files changed on disk.
 
-            # Check for package (directory with __init__.py) (e.g., s_root/pkg/module/__init__.py)
-            init_file = module_path_candidate / '__init__.py'
-            if init_file.exists() and init_file.is_file():
-                if init_file.is_relative_to(self.project_root) and not self.gitignore.is_ignored(init_file):
-                    resolved_files.add(init_file.resolve())
+        Only the given files are reparsed; files whose imports may now resolve differently
+        (because a module was added or deleted) are re-resolved from their known imports.
+        Cached results of build_dependency_graph are dropped only for entry points whose
+        reachable files were affected.
 
-        return resolved_files
+        :param changed_paths: Files whose content changed
+        :param deleted_paths: Files that were deleted
+        :param added_paths: Files that were created
+        :return: The entry points whose cached results were invalidated
+        """
+        if not self.global_graph_built:
+            self.build_global_graph()
+
+        def normalize(paths: Optional[List[Path]]) -> Set[Path]:
+            return {(self.project_root / p).resolve() for p in (paths or [])}
+
+        # Events are classified by the state of the disk, not by their kind: editors that save
+        # atomically report a delete and a create of the same file in one batch
+        reported = normalize(changed_paths) | normalize(deleted_paths) | normalize(added_paths)
+        deleted = {p for p in reported if p in self.all_python_files and not p.is_file()}
+        added = {
+            p for p in reported
+            if p not in self.all_python_files and p.suffix == '.py' and p.is_file()
+            and not self.gitignore.is_ignored(p)
+        }
+        changed = {p for p in reported if p in self.all_python_files and p not in deleted}
+
+        # Files importing a module that appeared or disappeared must be re-resolved
+        rewired: Set[Path] = set()
+        for file_path in deleted | added:
+            for module_name in self._module_names_for_file(file_path):
+                rewired.update(self._importers_by_name.get(module_name, set()))
+
+        for file_path in deleted:
+            self.all_python_files.discard(file_path)
+            self._remove_file(file_path)
+            self._external_imports.pop(file_path, None)
+            self._unindex_file(file_path)
+        for file_path in added:
+            self.all_python_files.add(file_path)
+            self._index_file(file_path)
+        if deleted or added:
+            # The walker's inventory no longer matches; it is rewalked the next time it is asked for
+            self.walker.refresh(ignore_rules=False)
+
+        for file_path in sorted(changed | added):
+            self._set_file_edges(file_path, self._parse_imports(file_path))
+        for file_path in sorted(rewired - deleted - changed - added):
+            self._set_file_edges(file_path, self._file_imports[file_path])
+
+        if self.cache is not None:
+            self.cache.evict_missing(self.all_python_files)
+        self.save_cache()
+
+        affected = changed | deleted | rewired
+        invalidated: Set[Path] = set()
+        for key, traversal in list(self._graph_results.items()):
+            if not traversal.files.isdisjoint(affected):
+                del self._graph_results[key]
+                invalidated.add(key[0])
+        return invalidated
+
+    def traverse(
+        self,
+        entry_point: Path,
+        max_depth: int = 10,
+        max_nodes: Optional[int] = None,
+        on_event: Optional[Callable[..., None]] = None
+    ) -> Traversal:
+        """
+        Breadth-first traversal of the imports of an entry point, bounded by depth and node count.
+
+        Only files reached at a depth below max_depth have their imports parsed: the files at
+        depth max_depth are part of the result but are never read. Imports are followed
+        all-or-nothing per file; with max_nodes, the traversal stops at the first file whose
+        imports would not fit, so the result is always a prefix of the unbounded traversal.
+
+        :param entry_point: The starting point for analysis
+        :param max_depth: Number of import levels to follow (1 = the entry point and its direct imports)
+        :param max_nodes: Maximum number of files in the result, or None for no limit
+        :param on_event: Optional callback invoked as the graph is discovered, with
+            ('node', file, depth), ('edge', source, target) or ('progress', processed, discovered)
+        """
+        entry_point = entry_point.resolve()
+        use_global_graph = self.global_graph_built and entry_point in self.all_python_files
+        key = (entry_point, max_depth, max_nodes)
+        if use_global_graph and on_event is None and key in self._graph_results:
+            return self._graph_results[key]
+
+        if use_global_graph:
+            graph = self.graph
+            paths = self.files.paths
+            ids = self.files.ids
+
+            def successors(file_path: Path) -> Set[Path]:
+                return {paths[dep] for dep in graph.successors(ids[file_path])}
+        else:
+            def successors(file_path: Path) -> Set[Path]:
+                return self._resolve_file_imports(file_path, self._parse_imports(file_path))
+
+        result = Traversal({entry_point}, defaultdict(set), {entry_point: 0}, set(), max_depth)
+        if on_event:
+            on_event('node', entry_point, 0)
+
+        frontier = [entry_point]
+        processed = 0
+        for depth in range(max_depth):
+            if self.jobs > 1 and not use_global_graph:
+                # Parse the whole level in parallel (at most max_nodes files of it can be expanded)
+                self._prefetch_imports(frontier if max_nodes is None else frontier[:max_nodes])
+
+            next_frontier: List[Path] = []
+            for index, current_file in enumerate(frontier):
+                direct_deps = successors(current_file)
+                new_deps = sorted(dep for dep in direct_deps if dep not in result.depths)
+                if max_nodes is not None and len(result.depths) + len(new_deps) > max_nodes:
+                    result.truncated.update(frontier[index:])
+                    if depth + 1 < max_depth:
+                        result.truncated.update(next_frontier)
+                    next_frontier = []
+                    break
+
+                for dep in new_deps:
+                    result.depths[dep] = depth + 1
+                    result.files.add(dep)
+                    next_frontier.append(dep)
+                    if on_event:
+                        on_event('node', dep, depth + 1)
+
+                if direct_deps:
+                    result.graph[current_file] = direct_deps
+
+                if on_event:
+                    for dep in sorted(direct_deps):
+                        on_event('edge', current_file, dep)
+                    processed += 1
+                    if processed % self.PROGRESS_INTERVAL == 0:
+                        on_event('progress', processed, len(result.files))
+
+            frontier = next_frontier
+            if not frontier:
+                break
 
-    def build_dependency_graph(self, entry_point: Path, max_depth: int = 10) -> Tuple[Set[Path], Dict[Path, Set[Path]]]:
+        if not use_global_graph:
+            self.save_cache()
+        elif on_event is None:
+            self._graph_results[key] = result
+        return result
+
+    def build_dependency_graph(
+        self,
+        entry_point: Path,
+        max_depth: int = 10,
+        on_event: Optional[Callable[..., None]] = None,
+        max_nodes: Optional[int] = None
+    ) -> Tuple[Set[Path], Dict[Path, Set[Path]]]:
         """
         Trace all imports starting from an entry point and build a dependency graph.
 
         Args:
             entry_point: The starting point for analysis
-            max_depth: Maximum depth to traverse (1 = only entry point, 2 = entry + direct deps, etc.)
+            max_depth: Number of import levels to follow (1 = the entry point and its direct imports)
+            on_event: Optional callback invoked as the graph is discovered, with
+                ('node', file, depth), ('edge', source, target) or ('progress', processed, discovered)
+            max_nodes: Maximum number of files in the result, or None for no limit (see traverse())
 
         Returns:
             A tuple containing:
             - A set of all files that are part of the dependency chain.
             - A dictionary representing the dependency graph (file -> set of direct imports).
         """
-        all_dependent_files: Set[Path] = set()
-        dependency_graph: Dict[Path, Set[Path]] = defaultdict(set)
+        result = self.traverse(entry_point, max_depth, max_nodes, on_event)
+        return result.files, result.graph
+
+    def trace_imports(self, entry_point: Path, max_depth: int = 10) -> Set[Path]:
+        """Trace all imports starting from an entry point and return a flat set of used files."""
+        all_dependent_files, _ = self.build_dependency_graph(entry_point, max_depth)
+        return all_dependent_files
+
+    def _entry_point_edges(self, entry_points: List[Path]) -> Dict[int, array]:
+        """Direct imports (as ids) of entry points that are not part of the global graph (e.g. gitignored scripts)."""
+        edges = {}
+        for entry_point in entry_points:
+            entry_id = self.files.intern(entry_point)
+            if entry_id not in self._out_edges:
+                deps = self._resolve_file_imports(entry_point, self._parse_imports(entry_point))
+                edges[entry_id] = array('i', sorted(self.files.intern(dep) for dep in deps))
+        return edges
+
+    def importers(self, file_path: Path, max_depth: Optional[int] = None) -> Dict[Path, int]:
+        """
+        Return every file that imports a file directly or transitively, with its import distance to it.
 
-        # Queue now stores tuples of (file_path, depth_level)
-        queue: List[Tuple[Path, int]] = [(entry_point.resolve(), 0)]
-        processed_for_imports: Set[Path] = set() # Files whose imports have been parsed
-        file_depths: Dict[Path, int] = {entry_point.resolve(): 0}  # Track depth of each file
+        Walks the reverse edges of the global graph, which is built once on first use and then kept
+        current by update(), so repeated queries only cost the size of the answer.
 
-        all_dependent_files.add(entry_point.resolve())
+        :param file_path: The imported file
+        :param max_depth: Maximum distance (1 = direct importers only); None for unbounded
+        """
+        if not self.global_graph_built:
+            self.build_global_graph()
+
+        target_id = self.files.ids.get(file_path.resolve())
+        if target_id is None or target_id not in self._out_edges:
+            return {}
+
+        graph = self.graph
+        seen = bytearray(len(self.files))
+        seen[target_id] = 1
+        distances: Dict[int, int] = {}
+        frontier = [target_id]
+        depth = 0
+
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for current_id in frontier:
+                for importer in graph.predecessors(current_id):
+                    if not seen[importer]:
+                        seen[importer] = 1
+                        distances[importer] = depth
+                        next_frontier.append(importer)
+            frontier = next_frontier
+
+        paths = self.files.paths
+        return {paths[file_id]: distance for file_id, distance in distances.items()}
+
+    def reachable_files(self, entry_points: List[Path], max_depth: Optional[int] = None) -> Set[Path]:
+        """
+        Return the union of files reachable from any of the entry points, in a single traversal.
 
-        head = 0
-        while head < len(queue):
-            current_file, current_depth = queue[head]
-            head += 1
+        :param entry_points: Files to start from
+        :param max_depth: Same depth rules as build_dependency_graph; None for unbounded
+        """
+        if not self.global_graph_built:
+            self.build_global_graph()
+
+        entry_points = [entry_point.resolve() for entry_point in entry_points]
+        extra_edges = self._entry_point_edges(entry_points)
+        graph = self.graph
+        reachable = bytearray(len(self.files))
+        frontier = []
+        for entry_point in entry_points:
+            entry_id = self.files.ids[entry_point]
+            if not reachable[entry_id]:
+                reachable[entry_id] = 1
+                frontier.append(entry_id)
+        depth = 0
+
+        while frontier and (max_depth is None or depth < max_depth):
+            next_frontier = []
+            for current_id in frontier:
+                for dep in extra_edges.get(current_id) or graph.successors(current_id):
+                    if not reachable[dep]:
+                        reachable[dep] = 1
+                        next_frontier.append(dep)
+            frontier = next_frontier
+            depth += 1
+
+        paths = self.files.paths
+        return {paths[file_id] for file_id, flag in enumerate(reachable) if flag}
+
+    def reachable_files_per_entry_point(self, entry_points: List[Path], max_depth: Optional[int] = None) -> List[Set[Path]]:
+        """
+        Return the files reachable from each entry point, computed in a single traversal.
 
-            if current_file in processed_for_imports:
-                continue
-            processed_for_imports.add(current_file)
+        Every file carries a bitset (an int) of the entry points that reached it; a level-synchronous
+        BFS only propagates bits that are new to a file, so each (file, entry point) pair is expanded
+        once and the per-entry depth limits match separate BFS runs exactly.
 
-            # Only process imports if we haven't reached max depth
-            if current_depth >= max_depth:
-                continue
+        :param entry_points: Files to start from
+        :param max_depth: Same depth rules as build_dependency_graph; None for unbounded
+        """
+        if not self.global_graph_built:
+            self.build_global_graph()
+
+        entry_points = [entry_point.resolve() for entry_point in entry_points]
+        extra_edges = self._entry_point_edges(entry_points)
+        graph = self.graph
+        seen = [0] * len(self.files)
+        frontier: Dict[int, int] = defaultdict(int)
+        for index, entry_point in enumerate(entry_points):
+            entry_id = self.files.ids[entry_point]
+            seen[entry_id] |= 1 << index
+            frontier[entry_id] |= 1 << index
+        depth = 0
+
+        while frontier and (max_depth is None or depth < max_depth):
+            next_frontier: Dict[int, int] = defaultdict(int)
+            for current_id, bits in frontier.items():
+                for dep in extra_edges.get(current_id) or graph.successors(current_id):
+                    new_bits = bits & ~seen[dep]
+                    if new_bits:
+                        seen[dep] |= new_bits
+                        next_frontier[dep] |= new_bits
+            frontier = next_frontier
+            depth += 1
+
+        paths = self.files.paths
+        results: List[Set[Path]] = [set() for _ in entry_points]
+        for file_id, bits in enumerate(seen):
+            while bits:
+                lowest = bits & -bits
+                results[lowest.bit_length() - 1].add(paths[file_id])
+                bits ^= lowest
+        return results
 
-            # Get imports from this file
-            imports = self._parse_imports(current_file)
-            direct_deps_for_current_file: Set[Path] = set()
-
-            # Resolve imports to files
-            for import_name in imports:
-                resolved_files = self._resolve_import_to_file(import_name, current_file)
-                for resolved_file in resolved_files:
-                    if resolved_file in self.all_python_files: # Ensure it's a project file
-                        direct_deps_for_current_file.add(resolved_file)
-                        if resolved_file not in all_dependent_files:
-                            all_dependent_files.add(resolved_file)
-                            new_depth = current_depth + 1
-                            file_depths[resolved_file] = new_depth
-                            # Only add to queue if within depth limit
-                            if new_depth < max_depth:
-                                queue.append((resolved_file, new_depth))
-
-            if direct_deps_for_current_file:
-                dependency_graph[current_file.resolve()] = direct_deps_for_current_file
-
-        return all_dependent_files, dependency_graph
+    def unused_definitions(self, files: Optional[Set[Path]] = None) -> Dict[Path, List[str]]:
+        """
+        Return the top-level functions and classes of each file that nothing in the project uses.
 
-    def trace_imports(self, entry_point: Path, max_depth: int = 10) -> Set[Path]:
-        """Trace all imports starting from an entry point and return a flat set of used files."""
-        all_dependent_files, _ = self.build_dependency_graph(entry_point, max_depth)
-        return all_dependent_files
+        A definition counts as used if it is referenced in its own file, imported by name
+        ("from module import name"), or if any file imports its module as a whole ("import module",
+        "from module import *"). Files are handled one chunk at a time from the cache or the parser,
+        so only the compact per-file results are kept, never the syntax trees.
+
+        :param files: Files whose definitions are reported (default: all project files)
+        """
+        report_files = self.all_python_files if files is None else files
+        candidates: Dict[Path, List[str]] = {}
+        used: Dict[Path, Set[str]] = defaultdict(set)
+        whole_modules: Set[Path] = set()
+
+        ordered_files = sorted(self.all_python_files)
+        for start in range(0, len(ordered_files), self.PARSE_CHUNK):
+            chunk = ordered_files[start:start + self.PARSE_CHUNK]
+            if self.jobs > 1:
+                self._prefetch_imports(chunk)
+            for file_path in chunk:
+                parsed = self._parse_file(file_path)
+                if parsed.definitions and file_path in report_files:
+                    candidates[file_path] = parsed.definitions
+                for module_name, names in parsed.symbols.items():
+                    targets = self._resolve_import_to_file(module_name, file_path)
+                    if '*' in names:
+                        whole_modules.update(targets)
+                    else:
+                        for target in targets:
+                            used[target].update(names)
+                # Remaining imports are submodules named in "from package import module"
+                for import_name in parsed.imports:
+                    if import_name not in parsed.symbols:
+                        whole_modules.update(self._resolve_import_to_file(import_name, file_path))
+
+        self.save_cache()
+        unused: Dict[Path, List[str]] = {}
+        for file_path, definitions in candidates.items():
+            if file_path in whole_modules:
+                continue
+            names = [name for name in definitions if name not in used.get(file_path, ())]
+            if names:
+                unused[file_path] = names
+        return unused
 
-    def analyze(self, entry_points: List[Path]) -> Dict[str, Set[Path]]:
+    def analyze(self, entry_points: List[Path], max_depth: int = 10) -> Dict[str, Set[Path]]:
         """Analyze the project starting from given entry points."""
-        results = {}
+        valid_entry_points = []
 
         for entry_point in entry_points:
             if entry_point.exists() and entry_point.is_file():
-                used_files = self.trace_imports(entry_point)
-                results[str(entry_point)] = used_files
+                valid_entry_points.append(entry_point)
             else:
                 print(f"Warning: Entry point {entry_point} does not exist", file=sys.stderr)
 
-        return results
+        used_files = self.reachable_files_per_entry_point(valid_entry_points, max_depth)
+        return {str(entry_point): files for entry_point, files in zip(valid_entry_points, used_files)}
+
+
+class PollingWatcher:
+    """Polls the project for Python file changes and feeds them to ImportTracer.update()."""
+
+    def __init__(self, tracer: ImportTracer, interval: float = 1.0, lock=None):
+        """
+        Initialize the PollingWatcher.
+
+        :param tracer: The tracer whose global graph is kept current
+        :param interval: Seconds between two scans of the project
+        :param lock: Lock held while the tracer is updated, shared with whoever else uses the tracer
+        """
+        self.tracer = tracer
+        self.interval = interval
+        self.lock = lock or threading.RLock()
+        with self.lock:
+            self._snapshot = self._take_snapshot()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _take_snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        # Rewalks the tracer's walker (inventory and ignore rules), so callers must hold self.lock
+        return self.tracer.python_file_stats(refresh=True)
+
+    def poll(self) -> Set[Path]:
+        """Scan once and apply any changes; returns the entry points that were invalidated."""
+        with self.lock:
+            snapshot = self._take_snapshot()
+            previous = self._snapshot
+            self._snapshot = snapshot
+
+            added = [p for p in snapshot if p not in previous]
+            deleted = [p for p in previous if p not in snapshot]
+            changed = [p for p, signature in snapshot.items() if p in previous and previous[p] != signature]
+            if not (added or deleted or changed):
+                return set()
+
+            return self.tracer.update(changed, deleted, added)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Warning: File watcher failed: {e}", file=sys.stderr)
+
+    def start(self):
+        """Start polling in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='dependency-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop polling."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
 
 
 def find_default_entry_points(project_root: Path) -> List[Path]:
@@ -363,50 +1650,29 @@ def find_default_entry_points(project_root: Path) -> List[Path]:
     ]
 
     entry_points = []
-    gitignore = GitignoreParser(project_root)
+    files = get_workspace_walker(project_root).files()
 
     for pattern in patterns:
         if '*/' in pattern:
             # Handle patterns with directory wildcards
             parts = pattern.split('/')
-            for root, dirs, files in os.walk(project_root):
-                root_path = Path(root)
-
-                # Skip gitignored directories
-                dirs[:] = [d for d in dirs if not gitignore.is_ignored(root_path / d)]
-
-                if parts[-1] in files:
+            for entry in files:
+                if entry.path.name == parts[-1]:
                     # Check if the path matches the pattern
-                    if len(parts) == 2 or (len(parts) > 2 and parts[-2] in root_path.parts):
-                        file_path = root_path / parts[-1]
-                        if not gitignore.is_ignored(file_path):
-                            entry_points.append(file_path)
+                    if len(parts) == 2 or (len(parts) > 2 and parts[-2] in entry.path.parent.parts):
+                        entry_points.append(entry.path)
         else:
             # Handle simple wildcard patterns
-            for file_path in project_root.rglob(pattern):
-                if file_path.is_file() and not gitignore.is_ignored(file_path):
-                    entry_points.append(file_path)
+            for entry in files:
+                if fnmatch.fnmatchcase(entry.path.name, pattern):
+                    entry_points.append(entry.path)
 
     return entry_points
 
 
 def get_all_python_files_for_selection(project_root: Path) -> List[Path]:
     """Get all Python files for interactive selection with autocomplete-like functionality."""
-    gitignore = GitignoreParser(project_root)
-    py_files = []
-
-    for root, dirs, files in os.walk(project_root):
-        root_path = Path(root)
-        # Skip gitignored directories
-        dirs[:] = [d for d in dirs if not gitignore.is_ignored(root_path / d)]
-
-        for file in sorted(files):
-            if file.endswith('.py'):
-                file_path = root_path / file
-                if not gitignore.is_ignored(file_path):
-                    py_files.append(file_path)
-
-    return sorted(py_files)
+    return sorted(entry.path for entry in get_workspace_walker(project_root).python_files())
 
 
 def select_single_entry_point(project_root: Path) -> Path:
@@ -691,50 +1957,191 @@ def generate_report(project_root: Path, results: Dict[str, Set[Path]], all_files
         print(f"Usage rate: {len(all_used_files) / len(all_files) * 100:.1f}%")
 
 
-def _generate_dependency_tree_lines_recursive(
-    file_path: Path,
-    dependency_graph: Dict[Path, Set[Path]],
-    project_root: Path,
-    prefix: str = "",
-    is_last_child: bool = True,
-    visited_in_path: Optional[Set[Path]] = None
-) -> List[str]:
-    """Recursively generates lines for the dependency tree."""
-    if visited_in_path is None:
-        visited_in_path = set()
+class Condensation(NamedTuple):
+    """A dependency graph with every strongly connected component (import cycle) collapsed into one node."""
+    representative: Dict[Path, Path]  # File -> first file of its component
+    members: Dict[Path, List[Path]]  # Representative -> sorted files of its component
+    graph: Dict[Path, Set[Path]]  # Acyclic graph between representatives
 
-    lines = []
-    # Display path relative to project root
-    display_path = file_path.relative_to(project_root) if file_path.is_relative_to(project_root) else file_path
 
-    connector = "└── " if is_last_child else "├── "
-    lines.append(f"{prefix}{connector}{display_path}")
+def strongly_connected_components(files: Set[Path], dependency_graph: Dict[Path, Set[Path]]) -> List[List[Path]]:
+    """
+    Find the strongly connected components of a dependency graph (iterative Tarjan, linear time).
 
-    # Cycle detection for the current path
-    if file_path in visited_in_path:
-        lines.append(f"{prefix}{'    ' if is_last_child else '│   '}└─ ... (circular dependency)")
-        return lines
+    :param files: All files of the graph (files without edges form their own component)
+    :param dependency_graph: File -> set of direct imports
+    :return: Components with sorted members, in reverse topological order (a component comes after
+             every component it imports)
+    """
+    index: Dict[Path, int] = {}
+    lowlink: Dict[Path, int] = {}
+    stack: List[Path] = []
+    on_stack: Set[Path] = set()
+    components: List[List[Path]] = []
 
-    new_visited_in_path = visited_in_path.copy()
-    new_visited_in_path.add(file_path)
+    for root in sorted(files | _graph_files(dependency_graph)):
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(sorted(dependency_graph.get(root, ()))))]
+
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(sorted(dependency_graph.get(successor, ())))))
+                    break
+                if successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+            else:
+                # All successors done: pop the node and close its component if it is a root
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+
+    return components
+
+
+def find_import_cycles(files: Set[Path], dependency_graph: Dict[Path, Set[Path]]) -> List[List[Path]]:
+    """Return every import cycle: components of more than one file, or a file importing itself."""
+    return [
+        component
+        for component in strongly_connected_components(files, dependency_graph)
+        if len(component) > 1 or component[0] in dependency_graph.get(component[0], ())
+    ]
 
-    direct_dependencies = sorted(
-        list(dependency_graph.get(file_path, set())),
-        key=lambda p: str(p.relative_to(project_root) if p.is_relative_to(project_root) else p)
-    )
 
-    for i, dep_file in enumerate(direct_dependencies):
-        new_prefix = prefix + ("    " if is_last_child else "│   ")
-        lines.extend(
-            _generate_dependency_tree_lines_recursive(
-                dep_file,
-                dependency_graph,
-                project_root,
-                new_prefix,
-                is_last_child=(i == len(direct_dependencies) - 1),
-                visited_in_path=new_visited_in_path
-            )
-        )
+def condense_dependency_graph(files: Set[Path], dependency_graph: Dict[Path, Set[Path]]) -> Condensation:
+    """Collapse each strongly connected component of a dependency graph into its first file."""
+    representative: Dict[Path, Path] = {}
+    members: Dict[Path, List[Path]] = {}
+    for component in strongly_connected_components(files, dependency_graph):
+        members[component[0]] = component
+        for file_path in component:
+            representative[file_path] = component[0]
+
+    graph: Dict[Path, Set[Path]] = defaultdict(set)
+    for source_file, target_files in dependency_graph.items():
+        source = representative[source_file]
+        for target_file in target_files:
+            target = representative[target_file]
+            if target != source:
+                graph[source].add(target)
+    return Condensation(representative, members, dict(graph))
+
+
+def _display_names(project_root: Path, files: Set[Path]) -> Dict[Path, str]:
+    """Map files to their paths relative to the project root (if inside it), computed once per file."""
+    return {
+        file_path: str(file_path.relative_to(project_root) if file_path.is_relative_to(project_root) else file_path)
+        for file_path in files
+    }
+
+
+def _graph_files(dependency_graph: Dict[Path, Set[Path]]) -> Set[Path]:
+    """All files appearing in a dependency graph, as importer or as import."""
+    return set(dependency_graph).union(*dependency_graph.values())
+
+
+def _condensed_display_names(
+    condensation: Condensation,
+    display_names: Dict[Path, str],
+    max_listed: int = 5
+) -> Dict[Path, str]:
+    """Display names for the nodes of a condensed graph; an import cycle lists its first max_listed files."""
+    names = {}
+    for representative, files in condensation.members.items():
+        if len(files) == 1:
+            names[representative] = display_names[representative]
+        else:
+            listed = ', '.join(display_names[f] for f in files[:max_listed])
+            more = ', ...' if len(files) > max_listed else ''
+            names[representative] = f"[import cycle of {len(files)} files] {listed}{more}"
+    return names
+
+
+def _iter_dependency_tree_lines(
+    root: Path,
+    dependency_graph: Dict[Path, Set[Path]],
+    display_names: Dict[Path, str],
+    dedupe: bool = False
+) -> Iterator[str]:
+    """
+    Yield the lines of the dependency tree below root (depth-first, children sorted by name).
+
+    Import cycles along the current path are cut with a "(circular dependency)" marker. With dedupe,
+    a module whose subtree was already printed is shown once more with a "→ see above" back-reference
+    instead of being expanded again, so the output is linear in the size of the graph.
+    """
+    def children(file_path: Path) -> List[Path]:
+        return sorted(dependency_graph.get(file_path, ()), key=display_names.__getitem__)
+
+    on_path = {root}
+    expanded = {root}
+    # (file, prefix of its children's lines, its sorted children, index of the next child)
+    stack = [(root, "", children(root), 0)]
+
+    while stack:
+        file_path, prefix, deps, index = stack[-1]
+        if index == len(deps):
+            stack.pop()
+            on_path.discard(file_path)
+            continue
+        stack[-1] = (file_path, prefix, deps, index + 1)
+
+        dep_file = deps[index]
+        is_last_child = index == len(deps) - 1
+        connector = "└── " if is_last_child else "├── "
+        child_prefix = prefix + ("    " if is_last_child else "│   ")
+        line = f"{prefix}{connector}{display_names[dep_file]}"
+
+        # Cycle detection for the current path
+        if dep_file in on_path:
+            yield line
+            yield f"{child_prefix}└─ ... (circular dependency)"
+            continue
+
+        dep_children = children(dep_file)
+        if dedupe and dep_file in expanded and dep_children:
+            yield f"{line} → see above"
+            continue
+
+        yield line
+        expanded.add(dep_file)
+        on_path.add(dep_file)
+        stack.append((dep_file, child_prefix, dep_children, 0))
+
+
+def _generate_dependency_tree_lines(
+    root: Path,
+    dependency_graph: Dict[Path, Set[Path]],
+    display_names: Dict[Path, str],
+    dedupe: bool = False,
+    max_lines: Optional[int] = None
+) -> List[str]:
+    """Generate the lines of the dependency tree below root, truncated after max_lines lines if given."""
+    lines_iter = _iter_dependency_tree_lines(root, dependency_graph, display_names, dedupe)
+    if max_lines is None:
+        return list(lines_iter)
+
+    lines = list(islice(lines_iter, max_lines))
+    if next(lines_iter, None) is not None:
+        lines.append(f"... (tree truncated after {max_lines} lines)")
     return lines
 
 
@@ -742,16 +2149,34 @@ def _generate_dot_output(
     entry_point: Path,
     all_dependent_files: Set[Path],
     dependency_graph: Dict[Path, Set[Path]],
-    project_root: Path
+    project_root: Path,
+    condensation: Optional[Condensation] = None
 ) -> str:
-    """Generates a Graphviz DOT language string for the dependency graph."""
+    """
+    Generates a Graphviz DOT language string for the dependency graph.
+
+    If a condensation is given, each import cycle is drawn as a single dashed box listing its files.
+    """
     dot_lines = ["digraph Dependencies {", "    rankdir=LR; // Left to right layout"]
 
-    # Define a helper to create safe IDs for DOT
+    display_names = _display_names(project_root, all_dependent_files | _graph_files(dependency_graph))
+    # Safe IDs for DOT, computed once per file: characters not suitable for DOT IDs are replaced
+    dot_ids = {p: re.sub(r'[^a-zA-Z0-9_]', '_', name) for p, name in display_names.items()}
+    entry_node = entry_point.resolve()
+
+    if condensation is not None:
+        labels = {
+            representative: '\\n'.join(display_names[f] for f in files)
+            for representative, files in condensation.members.items()
+        }
+        all_dependent_files = set(condensation.members)
+        dependency_graph = condensation.graph
+        entry_node = condensation.representative.get(entry_node, entry_node)
+    else:
+        labels = display_names
+
     def to_dot_id(p: Path) -> str:
-        rel_path_str = str(p.relative_to(project_root) if p.is_relative_to(project_root) else p)
-        # Replace characters not suitable for DOT IDs
-        return re.sub(r'[^a-zA-Z0-9_]', '_', rel_path_str)
+        return dot_ids[p]
 
     # Define nodes
     dot_lines.append("\n    // Node definitions")
@@ -759,10 +2184,16 @@ def _generate_dot_output(
 
     for file_path in sorted_files:
         node_id = to_dot_id(file_path)
-        label = str(file_path.relative_to(project_root) if file_path.is_relative_to(project_root) else file_path)
+        label = labels[file_path]
         attrs = f'label="{label}"'
-        if file_path.resolve() == entry_point.resolve():
-            attrs += ', style=filled, fillcolor=lightblue'
+        is_cycle = condensation is not None and len(condensation.members[file_path]) > 1
+        if is_cycle:
+            attrs += ', shape=box'
+        if file_path == entry_node:
+            attrs += ', style="filled,dashed"' if is_cycle else ', style=filled'
+            attrs += ', fillcolor=lightblue'
+        elif is_cycle:
+            attrs += ', style=dashed'
         dot_lines.append(f'    {node_id} [{attrs}];')
 
     # Define edges
@@ -780,8 +2211,22 @@ def _generate_dot_output(
     dot_lines.append("}")
     return "\n".join(dot_lines)
 
-def generate_dependency_report(project_root: Path, entry_point: Path, all_dependent_files: Set[Path], dependency_graph: Dict[Path, Set[Path]]):
-    """Generate a report showing dependencies for a single entry point."""
+def generate_dependency_report(
+    project_root: Path,
+    entry_point: Path,
+    all_dependent_files: Set[Path],
+    dependency_graph: Dict[Path, Set[Path]],
+    condense_cycles: bool = False,
+    dedupe_tree: bool = False,
+    max_tree_lines: Optional[int] = None
+):
+    """
+    Generate a report showing dependencies for a single entry point.
+
+    :param condense_cycles: Render every import cycle as a single node in the tree and the DOT file
+    :param dedupe_tree: Print each module's subtree only once, with back-references afterwards
+    :param max_tree_lines: Truncate the tree after this many lines
+    """
     print("\n" + "=" * 80)
     print("DEPENDENCY ANALYSIS REPORT")
     print("=" * 80)
@@ -795,32 +2240,43 @@ def generate_dependency_report(project_root: Path, entry_point: Path, all_depend
 
     tree_output_lines = [str(entry_point.relative_to(project_root))] # Root of the tree
 
-    direct_deps_of_entry = sorted(
-        list(dependency_graph.get(entry_point.resolve(), set())),
-        key=lambda p: str(p.relative_to(project_root) if p.is_relative_to(project_root) else p)
+    display_names = _display_names(project_root, all_dependent_files | _graph_files(dependency_graph))
+    cycles = find_import_cycles(all_dependent_files, dependency_graph)
+    condensation = condense_dependency_graph(all_dependent_files, dependency_graph) if condense_cycles else None
+    tree_graph = dependency_graph
+    tree_root = entry_point.resolve()
+    tree_names = display_names
+    if condensation is not None:
+        tree_graph = condensation.graph
+        tree_root = condensation.representative.get(tree_root, tree_root)
+        tree_names = _condensed_display_names(condensation, display_names)
+        tree_output_lines = [tree_names.get(tree_root, tree_output_lines[0])]
+
+    tree_output_lines.extend(
+        _generate_dependency_tree_lines(tree_root, tree_graph, tree_names, dedupe_tree, max_tree_lines)
     )
 
-    for i, dep_file in enumerate(direct_deps_of_entry):
-        tree_output_lines.extend(
-            _generate_dependency_tree_lines_recursive(
-                dep_file,
-                dependency_graph,
-                project_root,
-                prefix="", # Initial prefix for the first level children
-                is_last_child=(i == len(direct_deps_of_entry) - 1),
-                visited_in_path={entry_point.resolve()} # Start with entry_point in visited_in_path
-            )
-        )
-
     for line in tree_output_lines:
         print(line)
 
+    print("\n" + "=" * 80)
+    print(f"IMPORT CYCLES: {len(cycles)}")
+    print("=" * 80)
+
+    if cycles:
+        for i, cycle in enumerate(cycles, 1):
+            print(f"\nCycle {i} ({len(cycle)} file{'s' if len(cycle) != 1 else ''}):")
+            for file_path in cycle:
+                print(f"  ⟳ {display_names[file_path]}")
+    else:
+        print("\n✓ No import cycles found.")
+
     # Ask if user wants to save the list
     print("\n" + "-" * 80)
     save = input("\nSave dependency list to a file? (y/n): ").strip().lower()
     if save == 'y':
         output_file_dot = project_root / f'dependencies_{entry_point.stem}.dot'
-        dot_content = _generate_dot_output(entry_point, all_dependent_files, dependency_graph, project_root)
+        dot_content = _generate_dot_output(entry_point, all_dependent_files, dependency_graph, project_root, condensation)
         with open(output_file_dot, 'w') as f:
             f.write(dot_content)
         print(f"✓ Saved DOT graph to: {output_file_dot}")
@@ -832,6 +2288,489 @@ def generate_dependency_report(project_root: Path, entry_point: Path, all_depend
     print("=" * 80)
     print(f"Main file: {entry_point.relative_to(project_root)}")
     print(f"Total unique dependencies: {len(all_dependent_files)}")
+    print(f"Import cycles: {len(cycles)}")
+
+
+def _node_to_json(project_root: Path, file_path: Path) -> Dict:
+    """Convert a file to a graph node for the VS Code extension."""
+    return {
+        'id': str(file_path.relative_to(project_root)),
+        'label': file_path.name,
+        'fullPath': str(file_path),
+        'type': 'python'  # Since we're analyzing Python files
+    }
+
+
+def stream_dependency_graph(
+    tracer: ImportTracer,
+    entry_point: Path,
+    max_depth: int,
+    out=None,
+    max_nodes: Optional[int] = None
+):
+    """
+    Write the dependency graph as NDJSON records while the BFS discovers it.
+
+    Every line is a compact JSON object whose "kind" is one of: "start", "node"
+    (the node fields of the JSON output plus "depth"), "edge", "progress" or "done"
+    ("done" also tells whether max_nodes truncated the graph).
+    """
+    out = out or sys.stdout
+    project_root = tracer.project_root
+    counts = {'node': 0, 'edge': 0}
+
+    def write(record: Dict):
+        out.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def on_event(kind: str, first, second):
+        if kind == 'node':
+            write({'kind': 'node', **_node_to_json(project_root, first), 'depth': second})
+        elif kind == 'edge':
+            write({
+                'kind': 'edge',
+                'source': str(first.relative_to(project_root)),
+                'target': str(second.relative_to(project_root))
+            })
+        else:
+            write({'kind': 'progress', 'processed': first, 'discovered': second})
+            out.flush()
+        if kind in counts:
+            counts[kind] += 1
+
+    write({'kind': 'start', 'entryPoint': str(entry_point.relative_to(project_root)), 'maxDepth': max_depth})
+    traversal = tracer.traverse(entry_point, max_depth, max_nodes, on_event=on_event)
+    write({'kind': 'done', 'nodes': counts['node'], 'edges': counts['edge'], 'truncated': bool(traversal.truncated)})
+    out.flush()
+
+
+def dependency_graph_to_json(
+    project_root: Path,
+    entry_point: Path,
+    all_dependent_files: Set[Path],
+    dependency_graph: Dict[Path, Set[Path]],
+    max_depth: int,
+    condense_cycles: bool = False,
+    external_dependencies: Optional[Dict[Path, Set[str]]] = None,
+    traversal: Optional[Traversal] = None
+) -> Dict:
+    """
+    Convert a dependency graph to the JSON structure expected by the VS Code extension.
+
+    If the traversal that produced the graph is given, every node also gets its BFS "depth" and
+    whether it was "expanded" (its imports were followed); unexpanded nodes can be opened later
+    with the "expand" request of the server. "truncated" is then true if max_nodes cut the graph.
+
+    "cycles" lists the files of every import cycle. With condense_cycles, each cycle becomes a single
+    node of type "cycle" (identified by its first file, with all files under "members").
+    If external_dependencies (file -> imported top-level names outside the project) is given, each
+    external module becomes a node of type "external" with id "external:<name>" and an "origin" of
+    "stdlib", "third-party" or "unknown".
+    """
+    nodes = []
+    edges = []
+    cycles = find_import_cycles(all_dependent_files, dependency_graph)
+    representative = {}
+
+    if condense_cycles:
+        condensation = condense_dependency_graph(all_dependent_files, dependency_graph)
+        representative = condensation.representative
+        all_dependent_files = set(condensation.members)
+        dependency_graph = condensation.graph
+        # The entry point is shown as the node of its cycle
+        entry_point = condensation.representative.get(entry_point.resolve(), entry_point)
+
+    if traversal is not None:
+        expanded = traversal.expanded
+        components = condensation.members if condense_cycles else {}
+
+    # Create nodes, sorted by path so the output does not depend on set iteration order
+    for file_path in sorted(all_dependent_files):
+        node = _node_to_json(project_root, file_path)
+        if traversal is not None:
+            files = components.get(file_path, [file_path])
+            node['depth'] = min(traversal.depths[f] for f in files)
+            node['expanded'] = all(f in expanded for f in files)
+        if condense_cycles and len(condensation.members[file_path]) > 1:
+            members = condensation.members[file_path]
+            node['label'] = f"{node['label']} (+{len(members) - 1} in cycle)"
+            node['type'] = 'cycle'
+            node['members'] = [str(f.relative_to(project_root)) for f in members]
+        nodes.append(node)
+
+    # Create edges (sorted like the nodes), computing each file's relative path once rather than once per edge
+    rel_paths: Dict[Path, str] = {}
+    for source_file in sorted(dependency_graph):
+        target_files = sorted(dependency_graph[source_file])
+        for file_path in (source_file, *target_files):
+            if file_path not in rel_paths:
+                rel_paths[file_path] = str(file_path.relative_to(project_root))
+        source_rel = rel_paths[source_file]
+        for target_file in target_files:
+            edges.append({
+                'source': source_rel,
+                'target': rel_paths[target_file]
+            })
+
+    # External modules, one node each, with edges from (the nodes of) the files importing them
+    if external_dependencies:
+        external_edges = {
+            (str(representative.get(file_path, file_path).relative_to(project_root)), name)
+            for file_path, names in external_dependencies.items()
+            for name in names
+        }
+        for name in sorted({name for _, name in external_edges}):
+            nodes.append({
+                'id': f'external:{name}',
+                'label': name,
+                'fullPath': '',
+                'type': 'external',
+                'origin': classify_external_module(name)
+            })
+        for source_rel, name in sorted(external_edges):
+            edges.append({'source': source_rel, 'target': f'external:{name}'})
+
+    return {
+        'nodes': nodes,
+        'edges': edges,
+        'entryPoint': str(entry_point.relative_to(project_root)),
+        'maxDepth': max_depth,
+        'cycles': [[str(f.relative_to(project_root)) for f in cycle] for cycle in cycles],
+        **({'truncated': bool(traversal.truncated)} if traversal is not None else {})
+    }
+
+
+def reverse_dependencies_to_json(tracer: ImportTracer, target: Path, importers: Dict[Path, int]) -> Dict:
+    """
+    Convert the importers of a file to the graph JSON structure of the VS Code extension.
+
+    Nodes are the target (depth 0) and its importers, with their import distance as "depth";
+    edges are the imports between them, in the usual importer -> imported direction. A target that
+    is not a project Python file (e.g. gitignored) has no importers and yields just its own node.
+    """
+    project_root = tracer.project_root
+    target = target.resolve()
+    files = {target, *importers}
+    graph = tracer.graph
+    ids = tracer.files.ids
+    paths = tracer.files.paths
+    file_ids = {ids[file_path] for file_path in files if file_path in ids}
+
+    nodes = []
+    for file_path in sorted(files):
+        node = _node_to_json(project_root, file_path)
+        node['depth'] = importers.get(file_path, 0)
+        nodes.append(node)
+
+    edges = [
+        {'source': str(source.relative_to(project_root)), 'target': str(paths[dep].relative_to(project_root))}
+        for source in sorted(importers)
+        for dep in graph.successors(ids[source])
+        if dep in file_ids
+    ]
+
+    return {
+        'nodes': nodes,
+        'edges': edges,
+        'entryPoint': str(target.relative_to(project_root)),
+        'reverse': True
+    }
+
+
+def generate_unused_definitions_report(project_root: Path, unused: Dict[Path, List[str]]):
+    """Print the top-level definitions that no project file uses, grouped by file."""
+    print("\n" + "=" * 80)
+    print("UNUSED TOP-LEVEL DEFINITIONS")
+    print("=" * 80)
+    print(f"\nProject Root: {project_root}")
+    print(f"Definitions not used anywhere in the project: {sum(len(names) for names in unused.values())}")
+    print("(Names used only dynamically, e.g. via decorators, getattr or as script entry points, are listed too)")
+
+    for file_path in sorted(unused):
+        print(f"\n{file_path.relative_to(project_root)}")
+        for name in unused[file_path]:
+            print(f"  ✗ {name}")
+
+    if not unused:
+        print("\n✓ Every top-level function and class is used.")
+
+
+def generate_reverse_report(project_root: Path, target: Path, importers: Dict[Path, int]):
+    """Print the files importing a file, grouped by import distance."""
+    print("\n" + "=" * 80)
+    print("REVERSE DEPENDENCY REPORT")
+    print("=" * 80)
+    print(f"\nProject Root: {project_root}")
+    print(f"Imported File: {target.relative_to(project_root)}")
+    print(f"Files importing it (directly or transitively): {len(importers)}")
+
+    by_distance: Dict[int, List[str]] = defaultdict(list)
+    for file_path, distance in importers.items():
+        by_distance[distance].append(str(file_path.relative_to(project_root)))
+
+    for distance in sorted(by_distance):
+        print("\n" + "-" * 40)
+        print("Direct importers:" if distance == 1 else f"Importers at distance {distance}:")
+        for file_path in sorted(by_distance[distance]):
+            print(f"  ← {file_path}")
+
+    if not importers:
+        print("\n✓ No project file imports this file.")
+
+
+class InvalidParams(Exception):
+    """The params of a JSON-RPC request are missing, of the wrong type or name a file that does not exist."""
+
+
+class AnalysisServer:
+    """
+    Long-lived analysis process speaking line-delimited JSON-RPC 2.0 over stdin/stdout.
+
+    Tracers (file index, gitignore rules and parsed imports) are kept in memory per project root,
+    so only the first request for a root pays for the directory walk and the parsing.
+    """
+
+    PARSE_ERROR = -32700
+    INVALID_REQUEST = -32600
+    METHOD_NOT_FOUND = -32601
+    INVALID_PARAMS = -32602
+    SERVER_ERROR = -32000
+
+    def __init__(
+        self,
+        default_root: Path,
+        use_cache: bool = True,
+        cache_hash: bool = False,
+        jobs: int = 1,
+        watch_interval: Optional[float] = None,
+        fast_parse: bool = False
+    ):
+        """
+        Initialize the AnalysisServer.
+
+        :param default_root: Project root used when a request does not pass "root"
+        :param use_cache: Whether parsed imports are also persisted to .depcache
+        :param cache_hash: Whether the cache should also validate files by content hash
+        :param jobs: Number of worker processes used to parse files
+        :param watch_interval: If set, poll each project every this many seconds and update its graph
+        :param fast_parse: Whether to read the imports of files without nested imports with the tokenizer
+        """
+        self.default_root = default_root
+        self.use_cache = use_cache
+        self.cache_hash = cache_hash
+        self.jobs = jobs
+        self.watch_interval = watch_interval
+        self.fast_parse = fast_parse
+        self.tracers: Dict[Path, ImportTracer] = {}
+        self.watchers: Dict[Path, PollingWatcher] = {}
+        # Serializes requests with the watcher threads
+        self.lock = threading.RLock()
+        self.running = False
+        self.methods = {
+            'build_dependency_graph': self._build_dependency_graph,
+            'expand': self._expand,
+            'analyze': self._analyze,
+            'reverse': self._reverse,
+            'update': self._update,
+            'refresh': self._refresh,
+            'shutdown': self._shutdown,
+        }
+
+    @staticmethod
+    def _string_param(params: Dict, name: str, required: bool = True) -> Optional[str]:
+        value = params.get(name)
+        if value is None and not required:
+            return None
+        if not isinstance(value, str) or not value:
+            raise InvalidParams(f'"{name}" must be a non-empty string')
+        return value
+
+    @staticmethod
+    def _int_param(params: Dict, name: str, default: Optional[int] = None) -> Optional[int]:
+        value = params.get(name)
+        if value is None:
+            return default
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise InvalidParams(f'"{name}" must be a non-negative integer')
+        return value
+
+    @staticmethod
+    def _string_list_param(params: Dict, name: str, required: bool = True) -> List[str]:
+        value = params.get(name)
+        if value is None and not required:
+            return []
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise InvalidParams(f'"{name}" must be a list of strings')
+        return value
+
+    def _root(self, params: Dict) -> Path:
+        root = self._string_param(params, 'root', required=False)
+        return Path(root).resolve() if root else self.default_root
+
+    def _tracer(self, project_root: Path) -> ImportTracer:
+        tracer = self.tracers.get(project_root)
+        if tracer is None:
+            # Parsed imports always stay in memory; they only go to disk if caching is enabled
+            tracer = ImportTracer(
+                project_root,
+                use_cache=True,
+                cache_hash=self.cache_hash,
+                jobs=self.jobs,
+                persist_cache=self.use_cache,
+                fast_parse=self.fast_parse
+            )
+            tracer.build_global_graph()
+            self.tracers[project_root] = tracer
+            if self.watch_interval:
+                watcher = PollingWatcher(tracer, self.watch_interval, self.lock)
+                watcher.start()
+                self.watchers[project_root] = watcher
+        return tracer
+
+    def _entry_point(self, project_root: Path, entry: str) -> Path:
+        entry_point = project_root / entry
+        if not entry_point.is_file():
+            raise InvalidParams(f"Entry point {entry_point} does not exist")
+        return entry_point
+
+    def _graph_to_json(self, params: Dict, entry_param: str, default_depth: int) -> Dict:
+        project_root = self._root(params)
+        entry_point = self._entry_point(project_root, self._string_param(params, entry_param))
+        max_depth = self._int_param(params, 'maxDepth', default_depth)
+        max_nodes = self._int_param(params, 'maxNodes')
+        tracer = self._tracer(project_root)
+        traversal = tracer.traverse(entry_point, max_depth, max_nodes)
+        external_dependencies = None
+        if params.get('includeExternal'):
+            external_dependencies = tracer.external_dependencies(traversal.expanded)
+        return dependency_graph_to_json(
+            project_root, entry_point, traversal.files, traversal.graph, max_depth,
+            condense_cycles=bool(params.get('condenseCycles')),
+            external_dependencies=external_dependencies,
+            traversal=traversal
+        )
+
+    def _build_dependency_graph(self, params: Dict) -> Dict:
+        return self._graph_to_json(params, 'entryPoint', 10)
+
+    def _expand(self, params: Dict) -> Dict:
+        """Graph below a single node (by default only its direct imports), with depths relative to it."""
+        return self._graph_to_json(params, 'node', 1)
+
+    def _analyze(self, params: Dict) -> Dict:
+        project_root = self._root(params)
+        entry_points = [
+            self._entry_point(project_root, entry) for entry in self._string_list_param(params, 'entryPoints')
+        ]
+        tracer = self._tracer(project_root)
+        results = tracer.analyze(entry_points)
+
+        all_used_files: Set[Path] = set()
+        for used_files in results.values():
+            all_used_files.update(used_files)
+
+        return {
+            'usedFiles': {
+                str(Path(entry_point).relative_to(project_root)): sorted(
+                    str(f.relative_to(project_root)) for f in used_files if f.is_relative_to(project_root)
+                )
+                for entry_point, used_files in results.items()
+            },
+            'unusedFiles': sorted(
+                str(f.relative_to(project_root))
+                for f in tracer.all_python_files - all_used_files
+                if f.is_relative_to(project_root)
+            ),
+            'totalFiles': len(tracer.all_python_files)
+        }
+
+    def _reverse(self, params: Dict) -> Dict:
+        """Files importing "file" directly or transitively (up to "maxDepth" import levels, if given)."""
+        project_root = self._root(params)
+        target = self._entry_point(project_root, self._string_param(params, 'file'))
+        max_depth = self._int_param(params, 'maxDepth')
+        tracer = self._tracer(project_root)
+        return reverse_dependencies_to_json(tracer, target, tracer.importers(target, max_depth))
+
+    def _update(self, params: Dict) -> Dict:
+        """Apply file-change events (paths relative to the root or absolute) to the in-memory graph."""
+        project_root = self._root(params)
+        changed, deleted, added = (
+            [Path(p) for p in self._string_list_param(params, name, required=False)]
+            for name in ('changed', 'deleted', 'added')
+        )
+        invalidated = self._tracer(project_root).update(changed, deleted, added)
+        return {'invalidatedEntryPoints': sorted(str(p.relative_to(project_root)) for p in invalidated)}
+
+    def _refresh(self, params: Dict) -> Dict:
+        """Drop the in-memory state for a root so the next request rewalks the project."""
+        project_root = self._root(params)
+        watcher = self.watchers.pop(project_root, None)
+        if watcher is not None:
+            watcher.stop()
+        tracer = self.tracers.pop(project_root, None)
+        if tracer is not None:
+            tracer.close()
+        return {'refreshed': tracer is not None}
+
+    def _shutdown(self, params: Dict) -> Dict:
+        self.running = False
+        return {}
+
+    def _error(self, request_id, code: int, message: str) -> Dict:
+        return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+    def handle(self, line: str) -> Optional[Dict]:
+        """Handle a single JSON-RPC request line and return the response (None for notifications)."""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return self._error(None, self.PARSE_ERROR, f"Parse error: {e}")
+
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return self._error(None, self.INVALID_REQUEST, "Invalid request")
+
+        request_id = request.get('id')
+        is_notification = 'id' not in request
+        method = self.methods.get(request['method'])
+        params = request.get('params') or {}
+
+        if method is None:
+            response = self._error(request_id, self.METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+        elif not isinstance(params, dict):
+            response = self._error(request_id, self.INVALID_PARAMS, "Params must be an object")
+        else:
+            try:
+                with self.lock:
+                    result = method(params)
+                response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+            except InvalidParams as e:
+                response = self._error(request_id, self.INVALID_PARAMS, f"Invalid params: {e}")
+            except Exception as e:
+                response = self._error(request_id, self.SERVER_ERROR, str(e))
+
+        return None if is_notification else response
+
+    def serve_forever(self, stdin=None, stdout=None):
+        """Read requests from stdin until EOF or a shutdown request."""
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+        self.running = True
+
+        try:
+            for line in stdin:
+                if not line.strip():
+                    continue
+                response = self.handle(line)
+                if response is not None:
+                    stdout.write(json.dumps(response, separators=(',', ':')) + '\n')
+                    stdout.flush()
+                if not self.running:
+                    break
+        finally:
+            for watcher in self.watchers.values():
+                watcher.stop()
+            for tracer in self.tracers.values():
+                tracer.close()
 
 
 def test_gitignore_parsing(project_root: Path):
@@ -899,16 +2838,143 @@ def main():
         default=10,
         help='Maximum depth for dependency analysis (default: 10)'
     )
+    parser.add_argument(
+        '--condense-cycles',
+        action='store_true',
+        help='Render every import cycle as a single node in the tree, DOT and JSON output'
+    )
+    parser.add_argument(
+        '--reverse',
+        metavar='FILE',
+        help='List the files that import FILE directly or transitively (with --json-output: as a graph)'
+    )
+    parser.add_argument(
+        '--unused-symbols',
+        action='store_true',
+        help='List top-level functions and classes that no project file uses '
+             '(only in files reachable from the given entry points, if any)'
+    )
+    parser.add_argument(
+        '--include-external',
+        action='store_true',
+        help='With --json-output, add stdlib and third-party modules as "external" nodes'
+    )
+    parser.add_argument(
+        '--dedupe-tree',
+        action='store_true',
+        help='In the dependency tree, expand each module once and show "→ see above" for later occurrences'
+    )
+    parser.add_argument(
+        '--max-tree-lines',
+        type=int,
+        help='Truncate the dependency tree after this many lines'
+    )
+    parser.add_argument(
+        '--max-nodes',
+        type=int,
+        help='Stop the dependency analysis before the graph exceeds this many files'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='With --json-output, emit compact NDJSON node/edge/progress records as they are discovered'
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Stay resident and answer line-delimited JSON-RPC requests on stdin/stdout'
+    )
+    parser.add_argument(
+        '--watch',
+        type=float,
+        metavar='SECONDS',
+        help='With --serve, poll the project every SECONDS and keep the import graph current'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes for parsing files (default: 1, 0 = one per CPU)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Do not read or write the persistent import cache ({ImportCache.FILENAME})'
+    )
+    parser.add_argument(
+        '--cache-hash',
+        action='store_true',
+        help='Also validate cached imports by content hash, not just mtime and size'
+    )
+    parser.add_argument(
+        '--fast-parse',
+        action='store_true',
+        help='Read imports with the tokenizer instead of the AST for files without nested or conditional imports'
+    )
 
     args = parser.parse_args()
 
     project_root = args.root.resolve()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
 
     # Test gitignore parsing if requested
     if args.test_gitignore:
         test_gitignore_parsing(project_root)
         return
 
+    # Resident JSON-RPC mode for VS Code extension
+    if args.serve:
+        server = AnalysisServer(
+            project_root,
+            use_cache=not args.no_cache,
+            cache_hash=args.cache_hash,
+            jobs=jobs,
+            watch_interval=args.watch,
+            fast_parse=args.fast_parse
+        )
+        server.serve_forever()
+        return
+
+    # Reverse dependency query ("who imports this file?"); not limited by --max-depth
+    if args.reverse:
+        target = (project_root / args.reverse).resolve()
+        if not target.is_file():
+            print(f"Error: File {target} does not exist", file=sys.stderr)
+            sys.exit(1)
+
+        tracer = ImportTracer(
+            project_root, use_cache=not args.no_cache, cache_hash=args.cache_hash, jobs=jobs, fast_parse=args.fast_parse
+        )
+        importers = tracer.importers(target)
+        tracer.close()
+
+        if args.json_output:
+            print(json.dumps(reverse_dependencies_to_json(tracer, target, importers), indent=2))
+        else:
+            generate_reverse_report(project_root, target, importers)
+        return
+
+    # Symbol-level unused code report
+    if args.unused_symbols:
+        tracer = ImportTracer(
+            project_root, use_cache=not args.no_cache, cache_hash=args.cache_hash, jobs=jobs, fast_parse=args.fast_parse
+        )
+        files = None
+        if args.entry_points:
+            files = tracer.reachable_files([project_root / ep for ep in args.entry_points], args.max_depth)
+        unused = tracer.unused_definitions(files)
+        tracer.close()
+
+        if args.json_output:
+            print(json.dumps({
+                'unusedDefinitions': {
+                    str(file_path.relative_to(project_root)): names for file_path, names in sorted(unused.items())
+                }
+            }, indent=2))
+        else:
+            generate_unused_definitions_report(project_root, unused)
+        return
+
     # JSON output mode for VS Code extension
     if args.json_output:
         if not args.entry_points:
@@ -920,42 +2986,26 @@ def main():
             print(f"Error: Entry point {entry_point} does not exist", file=sys.stderr)
             sys.exit(1)
 
-        tracer = ImportTracer(project_root)
-        all_dependent_files, dependency_graph = tracer.build_dependency_graph(entry_point, args.max_depth)
-
-        # Convert to JSON format expected by VS Code extension
-        nodes = []
-        edges = []
-
-        # Create nodes
-        for file_path in all_dependent_files:
-            rel_path = file_path.relative_to(project_root)
-            file_type = 'python'  # Since we're analyzing Python files
-
-            nodes.append({
-                'id': str(rel_path),
-                'label': file_path.name,
-                'fullPath': str(file_path),
-                'type': file_type
-            })
-
-        # Create edges
-        for source_file, target_files in dependency_graph.items():
-            source_rel = source_file.relative_to(project_root)
-            for target_file in target_files:
-                target_rel = target_file.relative_to(project_root)
-                edges.append({
-                    'source': str(source_rel),
-                    'target': str(target_rel)
-                })
-
-        result = {
-            'nodes': nodes,
-            'edges': edges,
-            'entryPoint': str(entry_point.relative_to(project_root)),
-            'maxDepth': args.max_depth
-        }
+        tracer = ImportTracer(
+            project_root, use_cache=not args.no_cache, cache_hash=args.cache_hash, jobs=jobs, fast_parse=args.fast_parse
+        )
+        if args.stream:
+            stream_dependency_graph(tracer, entry_point, args.max_depth, max_nodes=args.max_nodes)
+            tracer.close()
+            return
 
+        traversal = tracer.traverse(entry_point, args.max_depth, args.max_nodes)
+        tracer.close()
+
+        external_dependencies = None
+        if args.include_external:
+            external_dependencies = tracer.external_dependencies(traversal.expanded)
+        result = dependency_graph_to_json(
+            project_root, entry_point, traversal.files, traversal.graph, args.max_depth,
+            condense_cycles=args.condense_cycles,
+            external_dependencies=external_dependencies,
+            traversal=traversal
+        )
         print(json.dumps(result, indent=2))
         return
 
@@ -979,7 +3029,9 @@ def main():
             sys.exit(0)
 
     # Analyze the project
-    tracer = ImportTracer(project_root)
+    tracer = ImportTracer(
+        project_root, use_cache=not args.no_cache, cache_hash=args.cache_hash, jobs=jobs, fast_parse=args.fast_parse
+    )
 
     if not tracer.all_python_files:
         print("\nNo Python files found in the project (excluding gitignored files).")
@@ -993,10 +3045,19 @@ def main():
             entry_point = project_root / args.entry_points[0]
 
         print(f"\nAnalyzing dependencies for: {entry_point.relative_to(project_root)}")
-        all_dependent_files, dependency_graph = tracer.build_dependency_graph(entry_point, args.max_depth)
+        all_dependent_files, dependency_graph = tracer.build_dependency_graph(
+            entry_point, args.max_depth, max_nodes=args.max_nodes
+        )
+
+        tracer.close()
 
         # Generate dependency report
-        generate_dependency_report(project_root, entry_point, all_dependent_files, dependency_graph)
+        generate_dependency_report(
+            project_root, entry_point, all_dependent_files, dependency_graph,
+            condense_cycles=args.condense_cycles,
+            dedupe_tree=args.dedupe_tree,
+            max_tree_lines=args.max_tree_lines
+        )
 
     else:
         # Find unused files mode
@@ -1007,6 +3068,7 @@ def main():
 
         print("\nAnalyzing imports...")
         results = tracer.analyze(entry_points)
+        tracer.close()
 
         # Generate unused files report
         generate_report(project_root, results, tracer.all_python_files)
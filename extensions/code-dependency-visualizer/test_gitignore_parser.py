@@ -0,0 +1,165 @@
+"""Regression tests for GitignoreParser: git's ignore semantics, checked by hand and against git itself."""
+
+import random
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, Set
+
+import pytest
+
+from find_unused_files import GitignoreParser, WorkspaceWalker
+
+
+def make_tree(root: Path, files: Dict[str, str]):
+    """Write files (relative posix path -> content) under root."""
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def walked(root: Path) -> Set[str]:
+    return {entry.rel_path for entry in WorkspaceWalker(root).files()}
+
+
+def test_negation_cannot_reinclude_under_ignored_directory(tmp_path):
+    make_tree(tmp_path, {
+        '.gitignore': 'logs/\n!logs/keep.txt\n',
+        'logs/keep.txt': '',
+        'logs/debug.txt': '',
+    })
+    parser = GitignoreParser(tmp_path)
+    assert parser.is_ignored_relative('logs', is_dir=True)
+    assert parser.is_ignored_relative('logs/keep.txt')
+    assert 'logs/keep.txt' not in walked(tmp_path)
+
+
+def test_negation_reincludes_file_when_only_contents_are_ignored(tmp_path):
+    make_tree(tmp_path, {
+        '.gitignore': 'logs/*\n!logs/keep.txt\n',
+        'logs/keep.txt': '',
+        'logs/debug.txt': '',
+    })
+    parser = GitignoreParser(tmp_path)
+    assert not parser.is_ignored_relative('logs', is_dir=True)
+    assert not parser.is_ignored_relative('logs/keep.txt')
+    assert parser.is_ignored_relative('logs/debug.txt')
+
+
+def test_later_rule_wins(tmp_path):
+    make_tree(tmp_path, {'.gitignore': '*.txt\n!important.txt\nimportant.txt\n'})
+    parser = GitignoreParser(tmp_path)
+    assert parser.is_ignored_relative('important.txt')
+    assert parser.is_ignored_relative('other.txt')
+
+
+def test_leading_slash_anchors_to_the_ignore_file_directory(tmp_path):
+    make_tree(tmp_path, {
+        '.gitignore': '/generated.py\n',
+        'pkg/.gitignore': '/local.py\n',
+    })
+    parser = GitignoreParser(tmp_path)
+    assert parser.is_ignored_relative('generated.py')
+    assert not parser.is_ignored_relative('pkg/generated.py')
+    assert parser.is_ignored_relative('pkg/local.py')
+    assert not parser.is_ignored_relative('local.py')
+    assert not parser.is_ignored_relative('pkg/sub/local.py')
+
+
+def test_middle_slash_anchors_and_plain_names_match_at_any_depth(tmp_path):
+    make_tree(tmp_path, {'.gitignore': 'docs/*.md\nscratch.py\n'})
+    parser = GitignoreParser(tmp_path)
+    assert parser.is_ignored_relative('docs/index.md')
+    assert not parser.is_ignored_relative('src/docs/index.md')
+    # A single * does not cross directories
+    assert not parser.is_ignored_relative('docs/api/index.md')
+    assert parser.is_ignored_relative('scratch.py')
+    assert parser.is_ignored_relative('a/b/scratch.py')
+
+
+def test_double_star_patterns(tmp_path):
+    make_tree(tmp_path, {'.gitignore': '**/fixtures\nout/**\na/**/z.py\n'})
+    parser = GitignoreParser(tmp_path)
+    assert parser.is_ignored_relative('fixtures', is_dir=True)
+    assert parser.is_ignored_relative('x/y/fixtures', is_dir=True)
+    assert parser.is_ignored_relative('out/file.py')
+    assert parser.is_ignored_relative('out/deep/file.py')
+    # "out/**" matches what is inside out/, not out itself
+    assert not parser.is_ignored_relative('out', is_dir=True)
+    assert parser.is_ignored_relative('a/z.py')
+    assert parser.is_ignored_relative('a/b/c/z.py')
+    assert not parser.is_ignored_relative('b/a/z.py')
+
+
+def test_directory_only_patterns_do_not_match_files(tmp_path):
+    make_tree(tmp_path, {'.gitignore': 'cache/\n'})
+    parser = GitignoreParser(tmp_path)
+    assert parser.is_ignored_relative('cache', is_dir=True)
+    assert parser.is_ignored_relative('src/cache', is_dir=True)
+    assert not parser.is_ignored_relative('cache')
+
+
+def test_nested_gitignore_overrides_parent(tmp_path):
+    make_tree(tmp_path, {
+        '.gitignore': '*.gen.py\n',
+        'keep/.gitignore': '!*.gen.py\n',
+    })
+    parser = GitignoreParser(tmp_path)
+    assert parser.is_ignored_relative('a.gen.py')
+    assert not parser.is_ignored_relative('keep/a.gen.py')
+    assert not parser.is_ignored_relative('keep/sub/a.gen.py')
+
+
+def test_info_exclude_has_lowest_priority(tmp_path):
+    make_tree(tmp_path, {
+        '.git/info/exclude': 'local_*.py\n',
+        '.gitignore': '!local_keep.py\n',
+    })
+    parser = GitignoreParser(tmp_path)
+    assert parser.is_ignored_relative('local_notes.py')
+    assert not parser.is_ignored_relative('local_keep.py')
+
+
+def test_escapes_and_character_classes(tmp_path):
+    make_tree(tmp_path, {'.gitignore': '\\#hash.py\n\\!bang.py\nfile[0-9].py\nname[!a].py\n'})
+    parser = GitignoreParser(tmp_path)
+    assert parser.is_ignored_relative('#hash.py')
+    assert parser.is_ignored_relative('!bang.py')
+    assert parser.is_ignored_relative('file7.py')
+    assert not parser.is_ignored_relative('filex.py')
+    assert parser.is_ignored_relative('nameb.py')
+    assert not parser.is_ignored_relative('namea.py')
+
+
+# Randomized comparison with git; names avoid the parser's built-in defaults (build/, env/, ...)
+NAMES = ['a', 'b', 'src', 'lib', 'tmp', 'x.py', 'y.txt', 'z.log', 'keep.py']
+PATTERNS = [
+    '*.log', '*.txt', '!y.txt', '!keep.py', 'tmp/', '/a', 'src/*.py', '**/lib', 'a/**', '!a/b',
+    'b/', '!b/', 'x.py', '/src/', '*.py', '!*.py', 'lib/**/x.py', '[ab]/', '?.py', 'src/**/keep.py',
+]
+
+
+def random_tree(rng: random.Random, root: Path):
+    files = {}
+    for _ in range(rng.randint(5, 25)):
+        depth = rng.randint(1, 4)
+        parts = [rng.choice(NAMES[:5]) for _ in range(depth - 1)] + [rng.choice(NAMES[5:])]
+        files['/'.join(parts)] = ''
+    for directory in ['', *sorted({rel.rpartition('/')[0] for rel in files if '/' in rel})]:
+        if rng.random() < (0.9 if not directory else 0.3):
+            rules = rng.sample(PATTERNS, rng.randint(1, 5))
+            files[f"{directory}/.gitignore" if directory else '.gitignore'] = '\n'.join(rules) + '\n'
+    make_tree(root, files)
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+@pytest.mark.parametrize('seed', range(40))
+def test_walk_matches_git_ls_files(tmp_path, seed):
+    random_tree(random.Random(seed), tmp_path)
+    subprocess.run(['git', 'init', '-q', str(tmp_path)], check=True)
+    listed = subprocess.run(
+        ['git', 'ls-files', '-co', '--exclude-standard'],
+        cwd=tmp_path, stdout=subprocess.PIPE, text=True, check=True
+    ).stdout.splitlines()
+    assert walked(tmp_path) == set(listed)
@@ -0,0 +1,129 @@
+"""Regression tests for ImportCache invalidation, including files modified around the time they were read."""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from find_unused_files import ImportCache, ImportTracer, ParsedFile, extract_imports
+
+HOUR_NS = 3600 * 10**9
+
+
+def write(path: Path, content: str, age_ns: int = HOUR_NS) -> Path:
+    """Write a file and backdate its mtime, so it is not within the racy window."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    mtime_ns = time.time_ns() - age_ns
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def cache_file(cache: ImportCache, file_path: Path):
+    """Parse a file the way ImportTracer does and store the result."""
+    parsed, content_hash, st = extract_imports(file_path, cache.project_root, want_hash=cache.use_hash)
+    cache.put(file_path, st, parsed, content_hash)
+    return parsed
+
+
+def test_unchanged_file_is_served_from_disk_cache(tmp_path):
+    module = write(tmp_path / 'a.py', 'import b\n')
+    cache = ImportCache(tmp_path)
+    parsed = cache_file(cache, module)
+    cache.save()
+
+    reloaded = ImportCache(tmp_path)
+    assert reloaded.get(module) == parsed
+    assert parsed.imports == ['b']
+
+
+def test_size_or_mtime_change_invalidates(tmp_path):
+    module = write(tmp_path / 'a.py', 'import b\n')
+    cache = ImportCache(tmp_path)
+    cache_file(cache, module)
+
+    write(module, 'import bb\n')
+    assert cache.get(module) is None
+
+    cache_file(cache, module)
+    write(module, 'import cc\n', age_ns=HOUR_NS // 2)  # Same size, newer mtime
+    assert cache.get(module) is None
+
+
+def test_content_hash_survives_touch_but_not_edit(tmp_path):
+    module = write(tmp_path / 'a.py', 'import b\n')
+    cache = ImportCache(tmp_path, use_hash=True)
+    parsed = cache_file(cache, module)
+
+    write(module, 'import b\n', age_ns=HOUR_NS // 2)  # Touched, same content
+    assert cache.get(module) == parsed
+
+    write(module, 'import c\n', age_ns=HOUR_NS // 4)  # Same size, different content
+    assert cache.get(module) is None
+
+
+def test_edit_after_the_stat_is_not_cached_under_the_new_signature(tmp_path):
+    module = write(tmp_path / 'a.py', 'import b\n')
+    cache = ImportCache(tmp_path)
+    parsed, content_hash, st = extract_imports(module, tmp_path)
+    # The file changes after it was read, before the result is stored
+    write(module, 'import c\n', age_ns=HOUR_NS // 2)
+    cache.put(module, st, parsed, content_hash)
+    assert cache.get(module) is None
+
+
+def test_recently_modified_file_is_revalidated(tmp_path):
+    module = write(tmp_path / 'a.py', 'import b\n', age_ns=0)
+    cache = ImportCache(tmp_path)
+    cache_file(cache, module)
+    # Stored with mtime 0: an edit within the same mtime tick would keep size and mtime
+    assert cache.entries['a.py'][0] == 0
+    assert cache.get(module) is None
+
+    hashed = ImportCache(tmp_path, use_hash=True, persistent=False)
+    parsed = cache_file(hashed, module)
+    assert hashed.get(module) == parsed
+
+
+def test_evicted_files_are_removed_on_save(tmp_path):
+    kept = write(tmp_path / 'a.py', 'import b\n')
+    gone = write(tmp_path / 'b.py', '')
+    cache = ImportCache(tmp_path)
+    cache_file(cache, kept)
+    cache_file(cache, gone)
+    cache.save()
+
+    cache = ImportCache(tmp_path)
+    cache.evict_missing({kept})
+    cache.save()
+    assert set(ImportCache(tmp_path).entries) == {'a.py'}
+
+
+def test_version_change_discards_entries(tmp_path):
+    module = write(tmp_path / 'a.py', 'import b\n')
+    cache = ImportCache(tmp_path)
+    cache_file(cache, module)
+    cache.save()
+
+    conn = sqlite3.connect(str(tmp_path / ImportCache.FILENAME))
+    conn.execute(f'PRAGMA user_version = {ImportCache.VERSION - 1}')
+    conn.commit()
+    conn.close()
+    assert ImportCache(tmp_path).entries == {}
+
+
+def test_tracer_reparses_edited_files(tmp_path):
+    write(tmp_path / 'main.py', 'import a\n')
+    write(tmp_path / 'a.py', '')
+    write(tmp_path / 'b.py', '')
+    tracer = ImportTracer(tmp_path, use_cache=True)
+    files, _ = tracer.build_dependency_graph(tmp_path / 'main.py', 5)
+    tracer.close()
+    assert {f.name for f in files} == {'main.py', 'a.py'}
+
+    write(tmp_path / 'main.py', 'import a, b\n', age_ns=HOUR_NS // 2)
+    tracer = ImportTracer(tmp_path, use_cache=True)
+    files, _ = tracer.build_dependency_graph(tmp_path / 'main.py', 5)
+    tracer.close()
+    assert {f.name for f in files} == {'main.py', 'a.py', 'b.py'}
+    assert ImportCache(tmp_path).entries['main.py'][3] == ParsedFile(['a', 'b'], {'a': ['*'], 'b': ['*']}, [])
@@ -0,0 +1,97 @@
+"""Regression tests for import cycle detection (strongly connected components) and graph condensation."""
+
+import random
+from pathlib import Path
+from typing import Dict, List, Set
+
+import pytest
+
+from find_unused_files import condense_dependency_graph, find_import_cycles, strongly_connected_components
+
+
+def graph_of(edges: Dict[str, str]) -> Dict[Path, Set[Path]]:
+    """Build a dependency graph from "a": "bc" (a imports b and c)."""
+    return {Path(source): {Path(target) for target in targets} for source, targets in edges.items()}
+
+
+def names(components: List[List[Path]]) -> List[List[str]]:
+    return [[str(file_path) for file_path in component] for component in components]
+
+
+# a -> b -> c -> a is a cycle, c -> d -> e -> d another, f imports itself, g stands alone
+KNOWN_GRAPH = graph_of({'a': 'b', 'b': 'c', 'c': 'ad', 'd': 'e', 'e': 'd', 'f': 'f'})
+KNOWN_FILES = {Path(name) for name in 'abcdefg'}
+
+
+def test_components_of_known_graph():
+    components = names(strongly_connected_components(KNOWN_FILES, KNOWN_GRAPH))
+    assert sorted(components) == [['a', 'b', 'c'], ['d', 'e'], ['f'], ['g']]
+
+
+def test_components_come_after_the_components_they_import():
+    components = strongly_connected_components(KNOWN_FILES, KNOWN_GRAPH)
+    position = {file_path: index for index, component in enumerate(components) for file_path in component}
+    assert position[Path('d')] < position[Path('a')]
+
+
+def test_cycles_include_self_imports_but_not_single_files():
+    cycles = names(find_import_cycles(KNOWN_FILES, KNOWN_GRAPH))
+    assert sorted(cycles) == [['a', 'b', 'c'], ['d', 'e'], ['f']]
+
+
+def test_acyclic_graph_has_no_cycles():
+    graph = graph_of({'a': 'bc', 'b': 'c', 'c': ''})
+    assert find_import_cycles({Path('a'), Path('b'), Path('c')}, graph) == []
+
+
+def test_condensation_of_known_graph():
+    condensation = condense_dependency_graph(KNOWN_FILES, KNOWN_GRAPH)
+    assert condensation.representative[Path('c')] == Path('a')
+    assert condensation.representative[Path('e')] == Path('d')
+    assert names([condensation.members[Path('a')]]) == [['a', 'b', 'c']]
+    # The edges inside a cycle disappear, including a self-import
+    assert condensation.graph == {Path('a'): {Path('d')}}
+
+
+def test_deep_chain_does_not_hit_the_recursion_limit():
+    files = [Path(f"m{index}") for index in range(20000)]
+    graph = {source: {target} for source, target in zip(files, files[1:] + files[:1])}
+    assert len(find_import_cycles(set(files), graph)) == 1
+
+
+def reachable(graph: Dict[Path, Set[Path]], start: Path) -> Set[Path]:
+    seen = {start}
+    stack = [start]
+    while stack:
+        for target in graph.get(stack.pop(), ()):
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return seen
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_components_match_mutual_reachability(seed):
+    rng = random.Random(seed)
+    files = [Path(f"f{index}") for index in range(rng.randint(1, 40))]
+    graph: Dict[Path, Set[Path]] = {}
+    for source in files:
+        targets = set(rng.sample(files, rng.randint(0, min(3, len(files)))))
+        if targets:
+            graph[source] = targets
+
+    components = strongly_connected_components(set(files), graph)
+    assert sorted(f for component in components for f in component) == sorted(files)
+
+    reach = {file_path: reachable(graph, file_path) for file_path in files}
+    component_of = {file_path: tuple(component) for component in components for file_path in component}
+    for a in files:
+        for b in files:
+            mutual = b in reach[a] and a in reach[b]
+            assert mutual == (component_of[a] == component_of[b])
+
+    condensation = condense_dependency_graph(set(files), graph)
+    for source, targets in condensation.graph.items():
+        for target in targets:
+            # The condensed graph is acyclic
+            assert source not in reachable(condensation.graph, target)
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Benchmark TodoFinder.find_todos on large synthetic workspaces.
+
+Each scenario generates its own workspace and is measured in a fresh interpreter:
+
+    mixed     many small files in every searchable language, a few TODOs each
+    binary    binary files, half of them behind searchable extensions
+    ignored   a small source tree next to deep gitignored and skipped directories
+    huge      a few very large files with only a handful of TODOs
+    dense     files with thousands of TODOs each
+
+Reported per scenario: wall time, throughput (MB/s and files/s over the files that are actually
+searched), peak RSS, time to the first TODO found, and the number of TODOs. With --warm, also the
+time of a run that finds every file unchanged in the TODO index (.todocache). Results record the
+last commit that changed scripts/find_todos.py ("revision", with "+dirty" for uncommitted changes),
+so a baseline says which scanner it measures; re-record it whenever a change affects performance.
+
+Usage:
+    python benchmarks/bench_find_todos.py                          # compare against baseline.json
+    python benchmarks/bench_find_todos.py --scale 0.2 --scenario dense
+    python benchmarks/bench_find_todos.py --scenario mixed --scale 30 --warm
+    python benchmarks/bench_find_todos.py --output benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'scripts'
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+# How a TODO comment is written, per extension; None = at the start of a plain line
+COMMENT_STYLES = {
+    '#': ['.py', '.r', '.sh', '.bash', '.zsh', '.ps1', '.rb', '.yaml', '.yml', '.dockerfile', '.makefile', ''],
+    '//': ['.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.cs', '.go', '.rs', '.php', '.swift', '.kt',
+           '.scala', '.scss', '.less'],
+    '/*': ['.css'],
+    '<!--': ['.html', '.xml', '.vue', '.svelte', '.md'],
+    None: ['.txt', '.rst', '.tex', '.json', '.sql', '.bat', '.cmd'],
+}
+EXTENSION_STYLES = {extension: style for style, extensions in COMMENT_STYLES.items() for extension in extensions}
+
+TODO_TEXTS = [
+    'fix the off-by-one error in the pager',
+    'implement retry with backoff',
+    'refactor this into a helper',
+    'document the return value',
+    'add unit test for empty input',
+    'check whether this is still needed',
+]
+FILLER = [
+    'value = compute(alpha, beta) + offset * scale',
+    'result = [item for item in items if item.enabled]',
+    'config["timeout"] = settings.get("timeout", 30)',
+    'logger.debug("processed %d records in %.2fs", count, elapsed)',
+]
+
+
+def todo_line(style, number: int) -> str:
+    text = TODO_TEXTS[number % len(TODO_TEXTS)]
+    keyword = ('TODO', 'FIXME', 'todo')[number % 3]
+    if style == '#':
+        return f"# {keyword}: {text} ({number})"
+    if style == '//':
+        return f"    // {keyword}: {text} ({number})"
+    if style == '/*':
+        return f"/* {keyword}: {text} ({number}) */"
+    if style == '<!--':
+        return f"<!-- {keyword}: {text} ({number}) -->"
+    return f"{keyword}: {text} ({number})"
+
+
+def source_text(extension: str, lines: int, todo_every: int, rng: random.Random) -> str:
+    style = EXTENSION_STYLES[extension]
+    out = []
+    for number in range(lines):
+        if todo_every and number % todo_every == todo_every // 2:
+            out.append(todo_line(style, number))
+        else:
+            out.append(rng.choice(FILLER))
+    return '\n'.join(out) + '\n'
+
+
+class Workspace:
+    """Writes the files of a synthetic workspace."""
+
+    def __init__(self, root: Path, seed: int):
+        self.root = root
+        self.rng = random.Random(seed)
+
+    def write(self, relative: str, data):
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data.encode('utf-8') if isinstance(data, str) else data)
+
+    def source(self, directory: str, index: int, extension: str, lines: int, todo_every: int):
+        name = 'Makefile' if extension == '' else f"file{index}{extension}"
+        self.write(f"{directory}/{name}", source_text(extension, lines, todo_every, self.rng))
+
+
+def scenario_mixed(workspace: Workspace, scale: float):
+    extensions = sorted(EXTENSION_STYLES)
+    for index in range(int(3000 * scale)):
+        extension = extensions[index % len(extensions)]
+        directory = f"src/pkg{index % 40}/mod{index % 7}" if extension else f"src/tool{index}"
+        workspace.source(directory, index, extension, 80, 25)
+
+
+def scenario_binary(workspace: Workspace, scale: float):
+    for index in range(int(1500 * scale)):
+        blob = b'\x89PNG\r\n\x1a\n\0\0\0\rIHDR' + bytes(workspace.rng.getrandbits(8) for _ in range(4096))
+        # Binary data behind a searchable extension: sniffed, then skipped
+        workspace.write(f"assets/data{index % 20}/blob{index}.json", blob)
+        # Not searchable at all
+        workspace.write(f"assets/img{index % 20}/image{index}.png", blob)
+    for index in range(int(100 * scale)):
+        workspace.source('src', index, '.py', 80, 25)
+
+
+def scenario_ignored(workspace: Workspace, scale: float):
+    workspace.write('.gitignore', 'logs/\ngenerated/\n*.tmp\n')
+    for index in range(int(200 * scale)):
+        workspace.source('src', index, '.ts', 80, 25)
+    for index in range(int(3000 * scale)):
+        deep = '/'.join(f"level{level}" for level in range(index % 12))
+        workspace.source(f"node_modules/lib{index % 30}/{deep}", index, '.js', 40, 10)
+        workspace.source(f"generated/out{index % 30}/{deep}", index, '.py', 40, 10)
+        workspace.write(f"src/cache/file{index}.tmp", 'TODO: temporary\n')
+
+
+def scenario_huge(workspace: Workspace, scale: float):
+    lines = int(400_000 * scale)
+    for index, extension in enumerate(['.txt', '.py', '.js']):
+        workspace.source('data', index, extension, lines, lines // 4)
+
+
+def scenario_dense(workspace: Workspace, scale: float):
+    for index, extension in enumerate(['.py', '.ts', '.md', '.txt'] * max(1, int(5 * scale))):
+        workspace.source('notes', index, extension, 6000, 2)
+
+
+SCENARIOS = {
+    'mixed': scenario_mixed,
+    'binary': scenario_binary,
+    'ignored': scenario_ignored,
+    'huge': scenario_huge,
+    'dense': scenario_dense,
+}
+
+
+class FirstResultList(list):
+    """Result list that remembers when the first TODO was added."""
+
+    def __init__(self, start: float):
+        super().__init__()
+        self.start = start
+        self.first_result = None
+
+    def _mark(self):
+        if self.first_result is None:
+            self.first_result = time.perf_counter() - self.start
+
+    def append(self, item):
+        self._mark()
+        super().append(item)
+
+    def extend(self, items):
+        items = list(items)
+        if items:
+            self._mark()
+        super().extend(items)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process."""
+    # VmHWM starts over at exec; ru_maxrss would include the memory of the parent that spawned us
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def warm_seconds(find_todos, workspace: Path, jobs: int) -> float:
+    """Index the workspace, then time a run over the unchanged files."""
+    for _ in range(2):
+        finder = find_todos.TodoFinder(str(workspace), jobs=jobs, use_cache=True)
+        finder._quiet_mode = True
+        start = time.perf_counter()
+        finder.find_todos()
+        seconds = time.perf_counter() - start
+    return round(seconds, 4)
+
+
+def measure(workspace: Path, jobs: int, warm: bool) -> Dict:
+    """Run find_todos on one workspace (in this process) and return the measurements."""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    import find_todos
+
+    finder = find_todos.TodoFinder(str(workspace), jobs=jobs)
+    finder._quiet_mode = True
+
+    # Record the files that pass the ignore rules; the binary ones are left out after timing
+    candidates = []
+    iter_candidate_files = finder._iter_candidate_files
+
+    def recording_iter_candidate_files():
+        for file in iter_candidate_files():
+            candidates.append(file[0])
+            yield file
+
+    finder._iter_candidate_files = recording_iter_candidate_files
+    start = time.perf_counter()
+    finder.todos = FirstResultList(start)
+    todos = finder.find_todos()
+    seconds = time.perf_counter() - start
+
+    searched = [file_path for file_path in candidates if not finder._is_binary_file(file_path)]
+    size_mb = sum(os.path.getsize(file_path) for file_path in searched) / (1024 * 1024)
+    results = {
+        'seconds': round(seconds, 4),
+        'searched_files': len(searched),
+        'searched_mb': round(size_mb, 2),
+        'mb_per_second': round(size_mb / seconds, 2) if seconds else None,
+        'files_per_second': round(len(searched) / seconds, 1) if seconds else None,
+        'first_result_seconds': None if finder.todos.first_result is None else round(finder.todos.first_result, 4),
+        'peak_rss_mb': peak_rss_mb(),
+        'todos': len(todos),
+        'pathspec': find_todos.HAS_PATHSPEC,
+    }
+    if warm:
+        results['warm_seconds'] = warm_seconds(find_todos, workspace, jobs)
+    return results
+
+
+def run_scenario(name: str, scale: float, seed: int, jobs: int, warm: bool) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = Workspace(Path(tmp).resolve(), seed)
+        SCENARIOS[name](workspace, scale)
+        # The finder reports progress on stderr in quiet mode; only show it if the run fails
+        child = subprocess.run(
+            [sys.executable, __file__, '--measure', str(workspace.root), '--jobs', str(jobs)] + (['--warm'] if warm else []),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+    if child.returncode != 0:
+        raise SystemExit(f"Scenario {name} failed:\n{child.stderr}")
+    return json.loads(child.stdout)
+
+
+def scanner_revision() -> Optional[str]:
+    """Short hash of the last commit that changed find_todos.py, or None outside a git checkout."""
+    script = SCRIPTS_DIR / 'find_todos.py'
+    try:
+        revision = subprocess.run(
+            ['git', 'log', '-1', '--format=%h', '--', script.name],
+            cwd=SCRIPTS_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD', '--', script.name], cwd=SCRIPTS_DIR).returncode
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    if not revision:
+        return None
+    return f"{revision}+dirty" if dirty else revision
+
+
+def compare(results: Dict, baseline: Dict) -> List[Tuple[str, float]]:
+    """Return (scenario, time ratio) against a baseline run at the same scale."""
+    if baseline.get('scale') != results['scale']:
+        print(f"\nBaseline was recorded at scale {baseline.get('scale')}; not comparing.")
+        return []
+
+    ratios = []
+    for name, result in results['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(name)
+        if old and old['seconds']:
+            ratios.append((name, result['seconds'] / old['seconds']))
+    return ratios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark find_todos on large synthetic workspaces.")
+    parser.add_argument('--scenario', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS),
+                        help='Scenarios to run (default: all)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Size multiplier for every scenario (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the generated workspaces')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Worker processes for find_todos (default: 1)')
+    parser.add_argument('--warm', action='store_true', help='Also time a run against an up-to-date TODO index')
+    parser.add_argument('--output', type=Path, help='Write the results to this JSON file')
+    parser.add_argument('--baseline', type=Path, default=BASELINE,
+                        help='Results to compare against (default: benchmarks/baseline.json)')
+    parser.add_argument('--measure', type=Path, help=argparse.SUPPRESS)  # Child mode: workspace to measure
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.jobs, args.warm)))
+        return
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'revision': scanner_revision(),
+        'scale': args.scale,
+        'jobs': args.jobs,
+        'scenarios': {},
+    }
+    for name in args.scenario:
+        result = run_scenario(name, args.scale, args.seed, args.jobs, args.warm)
+        results['scenarios'][name] = result
+        first = '-' if result['first_result_seconds'] is None else f"{result['first_result_seconds']:.3f} s"
+        print(f"{name:8} {result['seconds']:8.3f} s  {result['mb_per_second'] or 0:8.2f} MB/s  "
+              f"{result['files_per_second'] or 0:9.1f} files/s  peak RSS {result['peak_rss_mb']:7.1f} MB  "
+              f"first result {first:>9}  {result['todos']:>7} TODOs"
+              + (f"  warm {result['warm_seconds']:.3f} s" if 'warm_seconds' in result else ''))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + '\n')
+    elif args.baseline.exists():
+        ratios = compare(results, json.loads(args.baseline.read_text()))
+        if ratios:
+            revision = json.loads(args.baseline.read_text()).get('revision') or 'unknown revision'
+            print(f"\nTime vs {args.baseline.name} ({revision}):")
+            for name, ratio in ratios:
+                print(f"  {name:8} {ratio:6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,9 +8,16 @@ import os
 import re
 import json
 import fnmatch
+import time
+import hashlib
+import heapq
+import sqlite3
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Tuple, Set, Iterable, Iterator, Optional, Callable
 import argparse
 
 # Try to import pathspec for better gitignore handling, fallback to simple pattern matching
@@ -20,10 +27,189 @@ try:
 except ImportError:
     HAS_PATHSPEC = False
 
+class TodoCache:
+    """Per-file index of found TODOs, persisted between runs and validated by mtime, size and content hash."""
+
+    FILENAME = '.todocache'
+    # Bump whenever the stored record format or the TODO extraction changes
+    VERSION = 3
+    # Files modified this recently when they were read are always re-validated by hash
+    RACY_NS = 2_000_000_000
+
+    def __init__(self, root_path: Path, report: Callable[..., None] = print, settings: str = ''):
+        self.cache_path = root_path / self.FILENAME
+        self.root_path = root_path
+        self.report = report
+        # Finder settings the stored TODOs depend on; the index starts over when they change
+        self.settings = settings
+        # relative path -> (mtime_ns, size, git blob id of the content or None, TODO records as JSON)
+        self.entries: Dict[str, Tuple[int, int, Optional[str], str]] = {}
+        self._dirty: Set[str] = set()
+        self._seen: Set[str] = set()
+        self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.cache_path))
+        if conn.execute('PRAGMA user_version').fetchone()[0] != self.VERSION:
+            conn.execute('DROP TABLE IF EXISTS files')
+            conn.execute('DROP TABLE IF EXISTS settings')
+            conn.execute(f'PRAGMA user_version = {self.VERSION}')
+        conn.execute('CREATE TABLE IF NOT EXISTS settings (value TEXT)')
+        if conn.execute('SELECT value FROM settings').fetchall() != [(self.settings,)]:
+            with conn:
+                conn.execute('DROP TABLE IF EXISTS files')
+                conn.execute('DELETE FROM settings')
+                conn.execute('INSERT INTO settings (value) VALUES (?)', (self.settings,))
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS files ('
+            'path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, hash TEXT, todos TEXT)'
+        )
+        return conn
+
+    def _load(self):
+        """Load the index into memory; records are only decoded when a file is looked up."""
+        if not self.cache_path.exists():
+            return
+
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute('SELECT path, mtime_ns, size, hash, todos FROM files').fetchall()
+                self.entries = {row[0]: row[1:] for row in rows}
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.report(f"⚠️  Could not read TODO index {self.cache_path}: {e}")
+            self.entries = {}
+
+    @staticmethod
+    def hash_content(data: bytes) -> str:
+        """Hash file content the way git hashes blobs, so hashes can be compared with git's index."""
+        digest = TodoCache.content_digest(len(data))
+        digest.update(data)
+        return digest.hexdigest()
+
+    @staticmethod
+    def content_digest(size: int):
+        """Start hashing content of the given size as hash_content does, to be fed the content in pieces."""
+        return hashlib.sha1(b'blob %d\0' % size)
+
+    def lookup(
+        self,
+        file_path: str,
+        key: str,
+        blob_id: Optional[str] = None
+    ) -> Tuple[Optional[List[Dict]], Optional[os.stat_result]]:
+        """
+        Return the indexed TODOs of a file (None if it changed since it was indexed) and its current stat.
+
+        Files whose mtime changed but whose content did not (e.g. after a checkout) are recognized by hash.
+        If git vouches for the content of the file (blob_id), a matching hash is enough and the file is not
+        even stat'ed; the returned stat is then None.
+        """
+        self._seen.add(key)
+        entry = self.entries.get(key)
+        if blob_id is not None and entry is not None and entry[2] == blob_id:
+            return self._decode(entry[3]), None
+
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None, None
+
+        if entry is None:
+            return None, st
+
+        mtime_ns, size, content_hash, todos = entry
+        if st.st_size != size:
+            return None, st
+        if st.st_mtime_ns != mtime_ns:
+            if content_hash is None:
+                return None, st
+            try:
+                with open(file_path, 'rb') as f:
+                    if self.hash_content(f.read()) != content_hash:
+                        return None, st
+            except OSError:
+                return None, st
+            self.entries[key] = (st.st_mtime_ns, size, content_hash, todos)
+            self._dirty.add(key)
+
+        return self._decode(todos), st
+
+    @staticmethod
+    def _decode(todos: str) -> List[Dict]:
+        return json.loads(todos) if todos != '[]' else []
+
+    def store(self, key: str, st: os.stat_result, todos: List[Dict], content_hash: Optional[str]):
+        """Index the TODOs of a file, as of the given stat (taken before the file was read)."""
+        self._seen.add(key)
+        mtime_ns = st.st_mtime_ns
+        if content_hash is not None and time.time_ns() - mtime_ns < self.RACY_NS:
+            # Could still change within the same mtime tick; have the next run compare the hash
+            mtime_ns = 0
+        self.entries[key] = (mtime_ns, st.st_size, content_hash, json.dumps(todos, ensure_ascii=False))
+        self._dirty.add(key)
+
+    def save(self):
+        """Write new and changed entries and drop files that were not seen in this run (deleted or now ignored)."""
+        stale = [key for key in self.entries if key not in self._seen]
+        if not self._dirty and not stale:
+            return
+
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany('DELETE FROM files WHERE path = ?', [(key,) for key in stale])
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO files (path, mtime_ns, size, hash, todos) VALUES (?, ?, ?, ?, ?)',
+                        [(key, *self.entries[key]) for key in sorted(self._dirty)]
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.report(f"⚠️  Could not write TODO index {self.cache_path}: {e}")
+            return
+
+        for key in stale:
+            del self.entries[key]
+        self._dirty.clear()
+
+
 class TodoFinder:
-    def __init__(self, root_path: str = ".", output_format: str = "json"):
+    # What to do with files larger than max_file_size: search them a block at a time, search only
+    # their first max_file_size bytes, or skip them
+    LARGE_FILE_POLICIES = ('stream', 'head', 'skip')
+    # Bytes read at a time from large files
+    STREAM_BLOCK_SIZE = 4 * 1024 * 1024
+    # Bytes that are whitespace for the TODO regex, and the characters a whitespace run inside a
+    # match can follow: the end of a comment marker, of a keyword or a colon
+    _WHITESPACE_BYTES = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+    _RUN_OPENING_BYTES = frozenset(b'/#*-"\'oOeE:')
+
+    def __init__(
+        self,
+        root_path: str = ".",
+        output_format: str = "json",
+        jobs: int = 1,
+        use_cache: bool = False,
+        use_git: bool = False,
+        max_file_size: int = 16 * 1024 * 1024,
+        large_file_policy: str = 'stream'
+    ):
+        if large_file_policy not in self.LARGE_FILE_POLICIES:
+            raise ValueError(f"Unknown large file policy: {large_file_policy}")
+
         self.root_path = Path(root_path)
         self.output_format = output_format
+        self.jobs = max(1, jobs)  # Worker processes used to search files
+        self.use_cache = use_cache  # Whether to keep a TodoCache index in the workspace
+        self.use_git = use_git  # Whether to list files with git instead of walking the tree
+        self.max_file_size = max_file_size  # Files larger than this (in bytes) follow large_file_policy
+        self.large_file_policy = large_file_policy
+        # Blob ids from git's index of the listed files whose content git says is unchanged
+        self.git_blobs: Dict[str, str] = {}
         self.todos = []
         self._quiet_mode = False
         self._original_print = print
@@ -33,19 +219,33 @@ class TodoFinder:
         self.gitignore_patterns = set()
         self._gitignore_loaded = False
 
-        # Patterns to match TODO comments in various formats
+        # Keywords that start a TODO (matched case-insensitively)
+        self.keywords = ('todo', 'to-do', 'fixme', 'fix me')
+        self.todo_keywords = '(?:' + '|'.join(re.escape(keyword) for keyword in self.keywords) + ')'
+        # The keywords in UTF-8 for spotting blocks of large files that need decoding; the case-insensitive
+        # regex also matches 'i' to 'İ' and 'ı', so blocks containing those are decoded too
+        self._keyword_bytes = tuple(keyword.encode() for keyword in self.keywords)
+        self._dotted_i_bytes = ('İ'.encode(), 'ı'.encode())
+
+        # Patterns to match TODO comments in various formats; each captures the TODO text
         self.todo_patterns = [
             # Single-line comments (// or #)
-            r'(?://|#)\s*(?:TODO|Todo|todo|TO-DO|To-Do|to-do|FIXME|FIX ME|fix me)\s*[:：]?\s*(.+?)(?:\n|$)',
+            r'(?://|#)\s*' + self.todo_keywords + r'\s*[:：]?\s*(.+?)(?:\n|$)',
             # Multi-line comments (/* */ or <!-- -->)
-            r'(?:/\*|<!--)\s*(?:TODO|Todo|todo|TO-DO|To-Do|to-do|FIXME|FIX ME|fix me)\s*[:：]?\s*(.+?)(?:\*/|-->)',
+            r'(?:/\*|<!--)\s*' + self.todo_keywords + r'\s*[:：]?\s*(.+?)(?:\*/|-->)',
             # Python docstring style
-            r'"""\s*(?:TODO|Todo|todo|TO-DO|To-Do|to-do|FIXME|FIX ME|fix me)\s*[:：]?\s*(.+?)"""',
-            r"'''\s*(?:TODO|Todo|todo|TO-DO|To-Do|to-do|FIXME|FIX ME|fix me)\s*[:：]?\s*(.+?)'''",
+            r'"""\s*' + self.todo_keywords + r'\s*[:：]?\s*(.+?)"""',
+            r"'''\s*" + self.todo_keywords + r"\s*[:：]?\s*(.+?)'''",
             # Without comment markers (for plain text files)
-            r'^(?:TODO|Todo|todo|TO-DO|To-Do|to-do|FIXME|FIX ME|fix me)\s*[:：]?\s*(.+?)(?:\n|$)',
+            r'^' + self.todo_keywords + r'\s*[:：]?\s*(.+?)(?:\n|$)',
         ]
 
+        # All patterns as one alternation, compiled once; matches never overlap, so a TODO that
+        # several patterns would match is reported once (by the leftmost match)
+        self._todo_regex = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.todo_patterns), re.MULTILINE | re.IGNORECASE
+        )
+
         # File extensions to search
         self.searchable_extensions = {
             '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.cs',
@@ -104,27 +304,31 @@ class TodoFinder:
             # Path is not relative to root, don't ignore
             return False
 
+        return self._should_ignore_relative(str(rel_path))
+
+    def _should_ignore_relative(self, rel_path: str) -> bool:
+        """Check if a path relative to the root should be ignored based on gitignore rules."""
+        if not self.gitignore_spec and not self.gitignore_patterns:
+            return False
+
         # Convert to string with forward slashes (git style)
-        rel_path_str = str(rel_path).replace('\\', '/')
+        rel_path_str = rel_path.replace('\\', '/')
 
         if HAS_PATHSPEC and self.gitignore_spec:
             # Use pathspec for accurate gitignore matching
             return self.gitignore_spec.match_file(rel_path_str)
         else:
             # Fallback to simple pattern matching
+            parts = rel_path_str.split('/')
+            parents = ['/'.join(parts[:end]) for end in range(len(parts) - 1, 0, -1)] + ['.']
             for pattern in self.gitignore_patterns:
                 # Simple wildcard matching
                 if fnmatch.fnmatch(rel_path_str, pattern):
                     return True
                 # Check if any parent directory matches
-                for parent in rel_path.parents:
-                    try:
-                        parent_str = str(parent.relative_to(self.root_path)).replace('\\', '/')
-                        if fnmatch.fnmatch(parent_str, pattern):
-                            return True
-                    except ValueError:
-                        # Parent is not relative to root, skip
-                        continue
+                for parent_str in parents:
+                    if fnmatch.fnmatch(parent_str, pattern):
+                        return True
             return False
 
     def _print(self, *args, **kwargs):
@@ -135,45 +339,269 @@ class TodoFinder:
         self._original_print(*args, **kwargs)
 
     def find_todos(self) -> List[Dict]:
-        """Find all TODOs in the workspace."""
-        # Load gitignore patterns if not already loaded
+        """Find all TODOs in the workspace, ordered by file and line."""
+        # Load gitignore patterns if not already loaded (git applies them itself when listing files)
+        if not self.use_git:
+            self._ensure_gitignore_loaded()
+
+        self._print(f"🔍 Searching for TODOs in: {self.root_path}")
+
+        cache = TodoCache(self.root_path, self._print, self._cache_settings()) if self.use_cache else None
+        # Files to search, with their stat when the index needs it afterwards
+        pending: List[Tuple[str, str, Optional[os.stat_result]]] = []
+        reused = 0
+
+        for file_path, relative_path in self._iter_candidate_files():
+            st = None
+            if cache is not None:
+                todos, st = cache.lookup(file_path, relative_path, self.git_blobs.get(relative_path))
+                if todos is not None:
+                    self.todos.extend(todos)
+                    reused += 1
+                    continue
+                if st is None:
+                    continue  # Vanished since the walk
+
+            if self.jobs > 1:
+                pending.append((file_path, relative_path, st))
+            else:
+                self._add_results(cache, relative_path, st, *self._search_file(file_path, relative_path, cache is not None))
+
+        if pending:
+            self._search_files_in_parallel(cache, pending)
+
+        if cache is not None:
+            cache.save()
+            self._print(f"📦 Reused {reused} unchanged files from {TodoCache.FILENAME}")
+
+        # Same order and ids however the files were distributed
+        self.todos.sort(key=lambda todo: (todo['file'], todo['line']))
+        for index, todo in enumerate(self.todos, 1):
+            todo['id'] = index
+
+        self._print(f"\n✅ Found {len(self.todos)} TODOs")
+        return self.todos
+
+    def _cache_settings(self) -> str:
+        # Streamed files give the same TODOs as files read at once, so only head/skip depend on the size
+        if self.large_file_policy == 'stream':
+            return ''
+        return f"{self.large_file_policy} {self.max_file_size}"
+
+    def _ensure_gitignore_loaded(self):
         if not self._gitignore_loaded:
             self._load_gitignore()
             self._gitignore_loaded = True
 
-        self._print(f"🔍 Searching for TODOs in: {self.root_path}")
+    def _add_results(
+        self,
+        cache: Optional[TodoCache],
+        relative_path: str,
+        st: Optional[os.stat_result],
+        todos: List[Dict],
+        content_hash: Optional[str]
+    ):
+        self.todos.extend(todos)
+        if cache is not None and st is not None:
+            # Key files git vouches for by their blob in the index, which is what the next run compares
+            # (it can differ from the hash of the working tree bytes, e.g. with core.autocrlf)
+            if content_hash is not None:
+                content_hash = self.git_blobs.get(relative_path, content_hash)
+            cache.store(relative_path, st, todos, content_hash)
+
+    def _is_searchable(self, file: str) -> bool:
+        """Whether a file name has a searchable extension (same suffix rule as Path.suffix)."""
+        dot = file.rfind('.')
+        suffix = file[dot:] if 0 < dot < len(file) - 1 else ''
+        return suffix.lower() in self.searchable_extensions or suffix == ''
+
+    def _iter_candidate_files(self) -> Iterator[Tuple[str, str]]:
+        """Yield the files to search (not ignored, with a searchable extension) as (path, path relative to the root)."""
+        if self.use_git:
+            files = self._list_git_files()
+            if files is not None:
+                return iter(files)
+            self._ensure_gitignore_loaded()
+        return self._walk_candidate_files()
+
+    def _git_ls_files(self, *queries: Tuple[str, ...]) -> List[List[str]]:
+        """
+        Run several git ls-files queries at once in the root directory; paths are relative to it, with forward slashes.
+
+        Raises subprocess.CalledProcessError if one of them fails.
+        """
+        processes = [
+            subprocess.Popen(
+                ['git', 'ls-files', '-z', *args], cwd=self.root_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+            for args in queries
+        ]
+        results = []
+        for args, process in zip(queries, processes):
+            output, errors = process.communicate()
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(process.returncode, process.args, output, errors)
+            results.append(os.fsdecode(output).split('\0')[:-1])
+        return results
+
+    def _list_git_files(self) -> Optional[List[Tuple[str, str]]]:
+        """
+        List the files to search with git: tracked files and untracked files that git does not ignore.
+
+        Git's own ignore rules decide (nested .gitignore files, .git/info/exclude, core.excludesFile), and
+        files git tracks are searched even if they match an ignore pattern. Tracked files that git does
+        not report as modified get their blob id from the index in git_blobs. Returns None if the root
+        is not inside a git work tree or git is not available.
+        """
+        try:
+            tracked, modified, untracked = self._git_ls_files(
+                ('--cached', '--stage'), ('--modified',), ('--others', '--exclude-standard')
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            detail = e.stderr.decode(errors='replace').strip() if isinstance(e, subprocess.CalledProcessError) else e
+            self._print(f"⚠️  Could not list files with git, walking the directory instead: {detail}")
+            return None
+
+        modified = set(modified)
+        top_prefix = os.path.join(str(self.root_path), '')
+        skipped_dirs: Dict[str, bool] = {}
+        unmerged: Set[str] = set()
+        self.git_blobs = {}
+        files = []
+
+        def add(path: str, blob_id: Optional[str]):
+            directory, _, file = path.rpartition('/')
+
+            # Skip the TODO index (and its SQLite journal)
+            if not directory and file.startswith(TodoCache.FILENAME):
+                return
+
+            # Skip directories that are never searched, even if git tracks them
+            skipped = skipped_dirs.get(directory)
+            if skipped is None:
+                skipped = skipped_dirs[directory] = any(part in self.skip_dirs for part in directory.split('/'))
+            if skipped or not self._is_searchable(file):
+                return
+
+            relative_path = path if os.sep == '/' else path.replace('/', os.sep)
+            if blob_id is not None:
+                self.git_blobs[relative_path] = blob_id
+            files.append((top_prefix + relative_path, relative_path))
+
+        for entry in tracked:
+            info, _, path = entry.partition('\t')
+            mode, blob_id, stage = info.split(' ')
+            if mode == '160000':
+                continue  # Submodule
+            if stage != '0':
+                # Unmerged: listed once per stage, and the working tree holds neither
+                if path not in unmerged:
+                    unmerged.add(path)
+                    add(path, None)
+            elif mode == '120000' or path in modified:
+                # Symlinks are stored as their target, not the content they point to
+                add(path, None)
+            else:
+                add(path, blob_id)
+
+        for path in untracked:
+            if not path.endswith('/'):  # Untracked nested repository
+                add(path, None)
 
-        for root, dirs, files in os.walk(self.root_path):
-            root_path = Path(root)
+        return files
+
+    def _walk_candidate_files(self) -> Iterator[Tuple[str, str]]:
+        """Walk the tree for the files to search, applying .gitignore patterns in Python."""
+        # Plain strings rather than Path objects: on a warm index, walking is most of the work
+        top = str(self.root_path)
+        top_prefix = os.path.join(top, '')
+        for root, dirs, files in os.walk(top):
+            # os.walk builds every directory path by joining onto top
+            prefix = '' if root == top else root[len(top_prefix):] + os.sep
+            root_prefix = os.path.join(root, '')
 
             # Filter out directories that should be ignored
             dirs[:] = [
                 d for d in dirs
-                if d not in self.skip_dirs and not self._should_ignore_path(root_path / d)
+                if d not in self.skip_dirs and not self._should_ignore_relative(prefix + d)
             ]
 
             for file in files:
-                file_path = root_path / file
+                relative_path = prefix + file
+
+                # Skip the TODO index (and its SQLite journal)
+                if not prefix and file.startswith(TodoCache.FILENAME):
+                    continue
 
                 # Skip files that should be ignored
-                if self._should_ignore_path(file_path):
+                if self._should_ignore_relative(relative_path):
                     continue
 
                 # Skip files with unwanted extensions
-                if file_path.suffix.lower() not in self.searchable_extensions and file_path.suffix != '':
+                if not self._is_searchable(file):
                     continue
 
-                # Skip binary files
-                if self._is_binary_file(file_path):
-                    continue
+                yield root_prefix + file, relative_path
 
-                try:
-                    self._search_file(file_path)
-                except Exception as e:
-                    self._print(f"⚠️  Error reading {file_path}: {e}")
+    def _search_files_in_parallel(self, cache: Optional[TodoCache], pending: List[Tuple[str, str, Optional[os.stat_result]]]):
+        """Search files in a pool of worker processes, in chunks of about equal total size."""
+        stats = {relative_path: st for _, relative_path, st in pending}
+        chunks = self._balanced_chunks(pending, self.jobs * 4)
+        if len(chunks) < 2:
+            self._add_chunk_results(cache, stats, [_search_files(self._worker_settings(), chunks[0])])
+            return
 
-        self._print(f"\n✅ Found {len(self.todos)} TODOs")
-        return self.todos
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            self._add_chunk_results(
+                cache, stats, executor.map(_search_files, repeat(self._worker_settings()), chunks)
+            )
+
+    def _add_chunk_results(
+        self,
+        cache: Optional[TodoCache],
+        stats: Dict[str, Optional[os.stat_result]],
+        results: Iterable[List[Tuple[str, List[Dict], Optional[str]]]]
+    ):
+        for chunk_results in results:
+            for relative_path, todos, content_hash in chunk_results:
+                self._add_results(cache, relative_path, stats[relative_path], todos, content_hash)
+
+    def _worker_settings(self) -> Dict:
+        """Arguments for the TodoFinder of a worker process: what decides how files are searched."""
+        return {
+            'root_path': str(self.root_path),
+            'max_file_size': self.max_file_size,
+            'large_file_policy': self.large_file_policy,
+            # Content hashes are only computed when an index will store them
+            'use_cache': self.use_cache,
+        }
+
+    @staticmethod
+    def _balanced_chunks(
+        files: List[Tuple[str, str, Optional[os.stat_result]]],
+        count: int
+    ) -> List[List[Tuple[str, str]]]:
+        """
+        Split (path, relative path, stat) files into at most count chunks of (path, relative path),
+        each largest file going to the lightest chunk. Files are only stat'ed if no stat is given.
+        """
+        sized = []
+        for file_path, relative_path, st in files:
+            if st is None:
+                try:
+                    st = os.stat(file_path)
+                except OSError:
+                    st = None
+            sized.append((st.st_size if st is not None else 0, (file_path, relative_path)))
+        sized.sort(key=lambda item: item[0], reverse=True)
+
+        chunks: List[List[Tuple[str, str]]] = [[] for _ in range(min(count, len(files)))]
+        heap = [(0, index) for index in range(len(chunks))]
+        for size, file in sized:
+            total, index = heapq.heappop(heap)
+            chunks[index].append(file)
+            heapq.heappush(heap, (total + size, index))
+        return chunks
 
     def _is_binary_file(self, file_path: Path) -> bool:
         """Check if a file is binary."""
@@ -184,36 +612,200 @@ class TodoFinder:
         except:
             return True
 
-    def _search_file(self, file_path: Path):
-        """Search for TODOs in a single file."""
+    def _iter_todo_matches(self, content: str) -> Iterator[re.Match]:
+        """
+        Yield the matches of the combined TODO regex in order, trying it only where a keyword occurs.
+
+        Keywords are found with plain substring searches on the lowercased content, so files without
+        any TODO cost one lower() and a few find() calls instead of a regex scan.
+        """
+        if not content.isascii():
+            # Case-insensitive regex matching of non-ASCII text is not the same as lower(); scan it all
+            yield from self._todo_regex.finditer(content)
+            return
+
+        lowered = content.lower()
+        next_found = {keyword: lowered.find(keyword) for keyword in self.keywords}
+
+        def next_keyword(position: int) -> int:
+            for keyword, found in next_found.items():
+                if 0 <= found < position:
+                    next_found[keyword] = lowered.find(keyword, position)
+            return min((found for found in next_found.values() if found >= 0), default=-1)
+
+        end = 0  # End of the previous match
+        hit = next_keyword(0)
+        while hit >= 0:
+            # Every pattern starts either with a comment marker (at most 4 characters) followed by
+            # whitespace and the keyword, or with the keyword itself at the start of a line
+            marker_end = hit
+            while marker_end > end and content[marker_end - 1].isspace():
+                marker_end -= 1
+            starts = list(range(max(end, marker_end - 4), marker_end + 1))
+            if hit != marker_end:
+                starts.append(hit)
+
+            for start in starts:
+                match = self._todo_regex.match(content, start)
+                if match:
+                    yield match
+                    end = match.end()
+                    hit = next_keyword(end)
+                    break
+            else:
+                hit = next_keyword(hit + 1)
+
+    def _search_file(self, file_path: str, relative_path: str, want_hash: bool = False) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Search for TODOs in a single file; returns them with the content hash, if wanted for the index
+        (None if not wanted or the file was not searched in full).
+        """
+        # Skip binary files
+        if self._is_binary_file(file_path):
+            return [], None
+
+        todos = []
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-
-            # Search with all patterns
-            for pattern in self.todo_patterns:
-                matches = re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE)
-
-                for match in matches:
-                    todo_text = match.group(1).strip()
-                    if todo_text:  # Skip empty TODOs
-                        line_num = content[:match.start()].count('\n') + 1
-
-                        # Extract the whole line for context
-                        lines = content.splitlines()
-                        context_line = lines[line_num - 1] if line_num <= len(lines) else ""
-
-                        self.todos.append({
-                            'id': len(self.todos) + 1,
-                            'file': str(file_path.relative_to(self.root_path)),
-                            'line': line_num,
-                            'text': todo_text,
-                            'context': context_line.strip(),
-                            'category': self._categorize_todo(todo_text),
-                            'timestamp': datetime.now().isoformat()
-                        })
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size > self.max_file_size:
+                    return self._search_large_file(f, size, relative_path, want_hash)
+                data = f.read()
+            self._collect_todos(self._decode(data), relative_path, 1, todos)
         except Exception as e:
-            pass  # Silently skip files that can't be read
+            return [], None  # Silently skip files that can't be read
+
+        return todos, TodoCache.hash_content(data) if want_hash else None
+
+    @staticmethod
+    def _decode(data: bytes) -> str:
+        # Same text as reading in text mode: undecodable bytes dropped, universal newlines
+        content = data.decode('utf-8', errors='ignore')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
+    def _collect_todos(self, content: str, relative_path: str, first_line: int, todos: List[Dict]):
+        """Append the TODOs in content, which starts at line first_line of the file."""
+        # Matches come in order, so line numbers are counted incrementally from the previous match
+        line_num = first_line
+        counted_to = 0
+
+        # Search with all patterns at once; the captured group tells which pattern matched
+        for match in self._iter_todo_matches(content):
+            todo_text = match.group(match.lastindex).strip()
+            if todo_text:  # Skip empty TODOs
+                start = match.start()
+                line_num += content.count('\n', counted_to, start)
+                counted_to = start
+
+                # Extract the whole line for context
+                line_start = content.rfind('\n', 0, start) + 1
+                line_end = content.find('\n', start)
+                context_line = content[line_start:line_end if line_end >= 0 else len(content)]
+
+                todos.append({
+                    'id': len(todos) + 1,
+                    'file': relative_path,
+                    'line': line_num,
+                    'text': todo_text,
+                    'context': context_line.strip(),
+                    'category': self._categorize_todo(todo_text),
+                    'timestamp': datetime.now().isoformat()
+                })
+
+    def _search_large_file(self, f, size: int, relative_path: str, want_hash: bool = False) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Search an open file larger than max_file_size according to large_file_policy, a block at a time.
+
+        Blocks end at a line break where no TODO match can continue into the next block, so the TODOs
+        are the same as if the file was read at once; only blocks that contain a keyword are decoded.
+        """
+        if self.large_file_policy == 'skip':
+            return [], None
+
+        head_only = self.large_file_policy == 'head'
+        remaining = self.max_file_size if head_only else None
+        # The head of a file does not identify its content; it is validated by mtime and size only
+        digest = TodoCache.content_digest(size) if want_hash and not head_only else None
+
+        todos = []
+        line_num = 1
+        buffer = b''
+        searched = False  # Whether a block was searched already
+        while True:
+            chunk = f.read(self.STREAM_BLOCK_SIZE if remaining is None else min(self.STREAM_BLOCK_SIZE, remaining))
+            if digest is not None:
+                digest.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+
+            if not chunk or remaining == 0:
+                buffer += chunk
+                if remaining == 0:
+                    # Leave out the line cut off at the limit, unless it is the first line
+                    last_break = max(buffer.rfind(b'\n'), buffer.rfind(b'\r'))
+                    if last_break >= 0 or searched:
+                        buffer = buffer[:last_break + 1]
+                if buffer:
+                    self._search_block(buffer, relative_path, line_num, todos)
+                break
+
+            searched_to = len(buffer)
+            buffer += chunk
+            cut = self._block_end(buffer, searched_to)
+            if cut:
+                line_num = self._search_block(buffer[:cut], relative_path, line_num, todos)
+                buffer = buffer[cut:]
+                searched = True
+
+        return todos, digest.hexdigest() if digest is not None else None
+
+    def _block_end(self, buffer: bytes, start: int) -> int:
+        """
+        Return the last position after a line break in buffer where a block can end, or 0 if there is none.
+
+        Line breaks before start were already tried. A TODO match only spans lines through a run of
+        whitespace after a comment marker, a keyword or a colon; a block can end where the last
+        non-whitespace byte before it is none of those (non-ASCII bytes might be, so they do not qualify).
+        """
+        end = len(buffer)
+        while True:
+            line_break = max(buffer.rfind(b'\n', max(start - 1, 0), end), buffer.rfind(b'\r', max(start - 1, 0), end))
+            if line_break < 0:
+                return 0
+            end = line_break
+            following = buffer[line_break + 1:line_break + 2]
+            if buffer[line_break] == 0x0D and (not following or following == b'\n' or following[0] >= 0x80):
+                # Maybe the first half of a \r\n (undecodable bytes in between are dropped when decoding)
+                continue
+
+            # Last non-whitespace byte before the line break, looking back a piece at a time
+            position = line_break
+            last = None
+            while position > 0 and last is None:
+                piece = buffer[max(position - 256, 0):position].rstrip(self._WHITESPACE_BYTES)
+                if piece:
+                    last = piece[-1]
+                position -= 256
+            # Everything before the buffer already ended a block, so only whitespace since then is safe too
+            if last is None or (last < 0x80 and last not in self._RUN_OPENING_BYTES):
+                return line_break + 1
+
+    def _search_block(self, block: bytes, relative_path: str, first_line: int, todos: List[Dict]) -> int:
+        """Search a block of whole lines of a large file; returns the line number after the block."""
+        lowered = block.lower()
+        if any(keyword in lowered for keyword in self._keyword_bytes) or (
+            b'\xc4' in block and any(letter in block for letter in self._dotted_i_bytes)
+        ):
+            self._collect_todos(self._decode(block), relative_path, first_line, todos)
+
+        if b'\r' not in block:
+            return first_line + block.count(b'\n')
+        if not block.isascii():
+            # Undecodable bytes between \r and \n are dropped, making them one line break
+            return first_line + self._decode(block).count('\n')
+        return first_line + block.count(b'\n') + block.count(b'\r') - block.count(b'\r\n')
 
     def _categorize_todo(self, text: str) -> str:
         """Categorize TODO based on keywords."""
@@ -341,6 +933,15 @@ class TodoFinder:
             print(f"    ({todo['file']}:{todo['line']})")
 
 
+def _search_files(settings: Dict, files: List[Tuple[str, str]]) -> List[Tuple[str, List[Dict], Optional[str]]]:
+    """Search a chunk of (path, relative path) files in a worker process; ids are assigned after the results are merged."""
+    finder = TodoFinder(**settings)
+    return [
+        (relative_path, *finder._search_file(file_path, relative_path, finder.use_cache))
+        for file_path, relative_path in files
+    ]
+
+
 def main():
     parser = argparse.ArgumentParser(description="Find all TODO comments in your workspace")
     parser.add_argument('path', nargs='?', default='.', help='Path to search (default: current directory)')
@@ -349,11 +950,30 @@ def main():
                        default='markdown', help='Output format (default: markdown)')
     parser.add_argument('--no-summary', action='store_true', help='Skip printing summary')
     parser.add_argument('--extension-mode', action='store_true', help='Output JSON to stdout for VSCode extension integration')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                       help='Number of worker processes for searching files (default: 1, 0 = one per CPU)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help=f'Do not read or write the TODO index ({TodoCache.FILENAME}); search every file')
+    parser.add_argument('--max-file-size', type=float, default=16,
+                       help='Size in MB above which files are searched according to --large-files (default: 16)')
+    parser.add_argument('--large-files', choices=TodoFinder.LARGE_FILE_POLICIES, default='stream',
+                       help='Files larger than --max-file-size: search them a block at a time without loading them '
+                            'into memory (default), search only their first --max-file-size bytes, or skip them')
+    parser.add_argument('--git', action='store_true',
+                       help="List files with git (tracked, plus untracked files git does not ignore) instead of walking the directory")
 
     args = parser.parse_args()
 
         # Create finder and search
-    finder = TodoFinder(args.path, args.format)
+    finder = TodoFinder(
+        args.path,
+        args.format,
+        jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1),
+        use_cache=not args.no_cache,
+        use_git=args.git,
+        max_file_size=int(args.max_file_size * 1024 * 1024),
+        large_file_policy=args.large_files
+    )
 
     # In extension mode, suppress progress messages
     if args.extension_mode:
@@ -0,0 +1,96 @@
+"""Regression tests for block-wise searching of large files: the same TODOs as reading the file at once."""
+
+import random
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from find_todos import TodoFinder
+
+
+def finder(tmp_path: Path, policy: str = 'stream', max_file_size: int = 0, block_size: int = 16) -> TodoFinder:
+    todo_finder = TodoFinder(str(tmp_path), max_file_size=max_file_size, large_file_policy=policy)
+    todo_finder.STREAM_BLOCK_SIZE = block_size
+    return todo_finder
+
+
+def summary(todos) -> List[Tuple]:
+    return [(todo['line'], todo['text'], todo['context'], todo['category']) for todo in todos]
+
+
+def search_at_once(tmp_path: Path, path: Path) -> List[Tuple]:
+    todo_finder = TodoFinder(str(tmp_path), max_file_size=1 << 30)
+    return summary(todo_finder._search_file(str(path), path.name)[0])
+
+
+def search_streamed(tmp_path: Path, path: Path, block_size: int) -> List[Tuple]:
+    todo_finder = finder(tmp_path, block_size=block_size)
+    return summary(todo_finder._search_file(str(path), path.name)[0])
+
+
+def test_crlf_split_across_blocks(tmp_path):
+    path = tmp_path / 'crlf.txt'
+    path.write_bytes(b'x = 1\r\n' * 3 + b'# TODO: first\r\n' + b'y\r\n' * 5 + b'// FIXME: second\r\n')
+    expected = search_at_once(tmp_path, path)
+    assert [line for line, *_ in expected] == [4, 10]
+    for block_size in range(1, 40):
+        assert search_streamed(tmp_path, path, block_size) == expected
+
+
+def test_comment_marker_followed_by_line_break_at_block_end(tmp_path):
+    # "#" then a line break, then the keyword: the match spans the break, so no block may end there
+    path = tmp_path / 'span.py'
+    path.write_bytes(b'a = 1\n#\n   TODO: spans lines\nb = 2\n' * 4)
+    expected = search_at_once(tmp_path, path)
+    assert expected
+    for block_size in range(1, 30):
+        assert search_streamed(tmp_path, path, block_size) == expected
+
+
+def test_head_policy_drops_the_cut_off_line(tmp_path):
+    path = tmp_path / 'head.txt'
+    path.write_bytes(b'# TODO: kept\n# TODO: cut off here\n')
+    todos, content_hash = finder(tmp_path, 'head', max_file_size=20)._search_file(str(path), path.name, True)
+    assert [todo['text'] for todo in todos] == ['kept']
+    assert content_hash is None  # The head does not identify the content
+
+
+def test_head_policy_keeps_a_first_line_longer_than_the_limit(tmp_path):
+    path = tmp_path / 'long.txt'
+    path.write_bytes(b'# TODO: ' + b'x' * 100 + b'\n')
+    todos, _ = finder(tmp_path, 'head', max_file_size=30)._search_file(str(path), path.name)
+    assert len(todos) == 1
+
+
+def test_skip_policy(tmp_path):
+    path = tmp_path / 'skip.txt'
+    path.write_bytes(b'# TODO: never seen\n')
+    assert finder(tmp_path, 'skip')._search_file(str(path), path.name, True) == ([], None)
+
+
+def test_streamed_hash_matches_whole_file_hash(tmp_path):
+    path = tmp_path / 'hashed.txt'
+    path.write_bytes(b'# TODO: a\n' + b'filler line\n' * 50)
+    _, whole = TodoFinder(str(tmp_path), max_file_size=1 << 30)._search_file(str(path), path.name, True)
+    _, streamed = finder(tmp_path, block_size=7)._search_file(str(path), path.name, True)
+    assert whole is not None and whole == streamed
+
+
+# Pieces for random inputs: comment markers, keywords, separators, line breaks (CR, LF, CRLF),
+# Unicode whitespace, invalid UTF-8 and the dotted/dotless i that the case-insensitive regex folds
+PIECES = [
+    b'#', b'//', b'/*', b'<!--', b'"""', b'--', b';', b'TODO', b'todo', b'ToDo', b'FIXME', b'fix me', b'to-do',
+    b':', b' ', b'  ', b'\t', b'\n', b'\r', b'\r\n', b'\xc2\xa0', b'\xe2\x80\x83', b'\xff', b'\xc4',
+    'İ'.encode(), 'ı'.encode(), b'TODO:', b'task text', b'x', b'fix the bug', b'0', b'\x0b', b'\x0c',
+]
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_random_inputs_match_reading_at_once(tmp_path, seed):
+    rng = random.Random(seed)
+    path = tmp_path / 'random.txt'
+    path.write_bytes(b''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 120))))
+    expected = search_at_once(tmp_path, path)
+    for block_size in (1, 2, 3, 5, 8, 13, rng.randint(1, 64)):
+        assert search_streamed(tmp_path, path, block_size) == expected, block_size